@@ -0,0 +1,59 @@
+import threading
+
+
+class DebouncedSave:
+    """Runs `save` shortly after it is requested, so that a burst of requests
+    results in a single call
+
+    `save` is always called with a lock held, so that a snapshot taken and
+    written out by it cannot be overwritten by an older one from a concurrent
+    call.
+
+    :param save: callable taking no arguments, e.g. writing setpoints to file
+    :param delay: time (in s) to wait for further requests before saving
+    """
+
+    def __init__(self, save, delay=0.25):
+        self._save = save
+        self._delay = delay
+        # Guards _timer
+        self._timer_lock = threading.Lock()
+        self._timer = None
+        # Held across each call of save
+        self._save_lock = threading.Lock()
+
+    def request(self):
+        """Save shortly, unless a save is already pending"""
+        with self._timer_lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self._delay, self._timed_save)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timed_save(self):
+        with self._timer_lock:
+            self._timer = None
+        self._run()
+
+    def _run(self):
+        with self._save_lock:
+            self._save()
+
+    def _cancel(self):
+        """Cancel the pending save, returning whether there was one"""
+        with self._timer_lock:
+            timer, self._timer = self._timer, None
+        if timer is None:
+            return False
+        timer.cancel()
+        return True
+
+    def save_now(self):
+        """Save now, in place of any pending save"""
+        self._cancel()
+        self._run()
+
+    def flush(self):
+        """Save now if a save is pending"""
+        if self._cancel():
+            self._run()
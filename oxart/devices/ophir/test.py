@@ -1,8 +1,10 @@
-from .driver import *
 import atexit
 
 
 def main():
+    # imported here, as loading the driver pulls in the COM client
+    from .driver import OphirPowerMeter
+
     o = OphirPowerMeter()
     atexit.register(o.close)
     o.modify_wavelength(422)
@@ -1,7 +1,13 @@
+import logging
 import serial
 
 from oxart.devices.prologix_gpib.driver import GPIB
 
+logger = logging.getLogger(__name__)
+
+# Consumed bytes are dropped from a ReadBuffer once this many accumulate
+_COMPACT_SIZE = 4096
+
 
 def get_stream(device, baudrate=115200, port=None, timeout=None):
     """ Returns a pySerial-compatible interface to a hardware connection.
@@ -26,3 +32,60 @@ def get_stream(device, baudrate=115200, port=None, timeout=None):
     controller_addr, gpib_port = device[7:].split('-')
     controller = GPIB(controller_addr, timeout=timeout)
     return controller.get_stream(int(gpib_port))
+
+
+def enable_low_latency(stream):
+    """Have the kernel hand over received bytes without batching them up
+
+    Worthwhile for devices driven by short request/response exchanges. This is
+    only available on Linux, and not for all serial drivers, so failure is
+    merely logged."""
+    try:
+        stream.set_low_latency_mode(True)
+    except (AttributeError, ValueError) as e:
+        logger.debug("Could not enable low latency mode: %s", e)
+
+
+class ReadBuffer:
+    """Read-ahead buffer for parsing binary messages from a stream in place
+
+    Received bytes are kept in `data`, of which those before `pos` have
+    already been consumed.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.data = bytearray()
+        self.pos = 0
+
+    def ensure(self, n):
+        """Block until at least `n` unconsumed bytes are buffered
+
+        Everything already waiting at the stream is read along in the same call,
+        so that back-to-back messages cost a single read. Raises TimeoutError if
+        a read times out."""
+        data, stream = self.data, self.stream
+        missing = n - (len(data) - self.pos)
+        while missing > 0:
+            chunk = stream.read(max(missing, stream.in_waiting))
+            if not chunk:
+                raise TimeoutError("Timeout while reading from the stream")
+            data += chunk
+            missing -= len(chunk)
+
+    def consume(self, size):
+        """Mark the next `size` buffered bytes as read"""
+        data = self.data
+        pos = self.pos + size
+        if pos == len(data):
+            data.clear()
+            pos = 0
+        elif pos > _COMPACT_SIZE:
+            del data[:pos]
+            pos = 0
+        self.pos = pos
+
+    def clear(self):
+        """Drop all buffered bytes"""
+        self.data.clear()
+        self.pos = 0
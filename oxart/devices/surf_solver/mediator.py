@@ -1,26 +1,93 @@
 import numpy as np
 from collections import namedtuple
-from collections.abc import Iterable
 from copy import deepcopy
+from functools import cached_property
 from scipy.constants import value as const
 
+# CODATA lookups are comparatively slow, so only do them once
+_ELEMENTARY_CHARGE = const("atomic unit of charge")
+_ATOMIC_MASS = const("atomic mass constant")
+_EPS0_4PI = 4 * np.pi * const("vacuum electric permittivity")
+
 Wells = namedtuple(
     "Wells", "name,z,width,dphidx,dphidy,dphidz,rx_axial,ry_axial,"
     "phi_radial,d2phidaxial2,d3phidz3,d2phidradial_h2")
 Wells.__doc__ = """Represents a snapshot of the parameters of potential wells
 
-all parameters are tuples with 'length = <number of potential wells>'
+`name` is a list of labels, all other parameters are float arrays, each
+with 'length = <number of potential wells>'
 :param name: label for each potential well
 :param z: well centre position. Entries are sorted by position.
 ... respective parameters of the desired potential well"""
 
-Waveform = namedtuple("Waveform", "voltage_vec_list,el_vec,fixed_wells,wells_idx")
-Waveform.__doc__ = """Represents the electrode voltage evolution
 
-:param voltage_vec_list: time ordered list of electrode voltages
-:param el_vec: vector matching electrode names to voltages
-:param fixed_wells: time ordered list of specified target `Wells`
-:param wells_idx: list relating voltage_list indices to fixed_wells"""
+def _name_index(wells):
+    """Map the well names of a `Wells` snapshot to their index"""
+    return {name: idx for idx, name in enumerate(wells.name)}
+
+
+def _pop_well(wells, idx):
+    """Separate the well at `idx` from the other wells in `wells`
+
+    :returns: tuple of `Wells`: (well at `idx`, all other wells)"""
+    target = Wells([wells.name[idx]], *(np.take(col, [idx]) for col in wells[1:]))
+    return target, _drop_wells(wells, [idx])
+
+
+def _drop_wells(wells, idxs):
+    """Return a copy of `wells` without the wells at indices `idxs`"""
+    idxs = set(idxs)
+    return Wells([name for j, name in enumerate(wells.name) if j not in idxs],
+                 *(np.delete(col, list(idxs)) for col in wells[1:]))
+
+
+def _insert_wells(wells, idx, new):
+    """Return a copy of `wells` with the wells in `new` inserted before `idx`"""
+    return Wells([*wells.name[:idx], *new.name, *wells.name[idx:]],
+                 *(np.insert(np.asarray(col, dtype=float), idx, new_col)
+                   for col, new_col in zip(wells[1:], new[1:])))
+
+
+def _split_well(well, names, separation):
+    """Turn a single well into two copies `separation` apart along z
+
+    :param well: `Wells` holding a single well
+    :param names: names of the two new wells"""
+    # one row per parameter (z first), one column per new well
+    cols = np.repeat(np.array(well[1:], dtype=float), 2, axis=1)
+    cols[0] += (-separation / 2, separation / 2)
+    return Wells(list(names), *cols)
+
+
+def _wells_dict(wells):
+    """`wells` as a dict of lists, the form the driver takes it in
+
+    The driver's solution cache is keyed on the pyon encoding of this, and
+    pyon RPC handles lists rather than arrays."""
+    return {
+        field: col if field == "name" else np.asarray(col).tolist()
+        for field, col in zip(wells._fields, wells)
+    }
+
+
+def _concat_wells(*wells):
+    """Join several `Wells` snapshots into one, in the given order"""
+    return Wells([name for w in wells for name in w.name],
+                 *(np.concatenate(cols) for cols in zip(*(w[1:] for w in wells))))
+
+
+class Waveform(namedtuple("Waveform", "voltage_vec_list,el_vec,fixed_wells,wells_idx")):
+    """Represents the electrode voltage evolution
+
+    :param voltage_vec_list: time ordered list of electrode voltages
+    :param el_vec: vector matching electrode names to voltages
+    :param fixed_wells: time ordered list of specified target `Wells`
+    :param wells_idx: list relating voltage_list indices to fixed_wells"""
+
+    @cached_property
+    def _el_set(self):
+        """Electrode names as a set (el_vec is fixed for a waveform's life)"""
+        return frozenset(self.el_vec)
 
 
 class SURFMediator:
@@ -68,21 +135,45 @@ class SURFMediator:
         :param charge: this must match the value of SURF.Constants.q
         :param mass: mass of ion in atomic mass units."""
         self.driver = dmgr.get(device)
-        if default_electrode_override is None:
-            self.default_electrodes = self.get_all_electrode_names()
-        else:
-            self.default_electrodes = default_electrode_override
+        self._default_electrode_override = default_electrode_override
 
         self.default_z_grid = default_z_grid_override
         self.default_f_axial = default_f_axial
         self.default_f_rad_x = default_f_rad_x
         self.default_split_start = default_split_start_curvature
         self.default_split_end = default_split_end_curvature
-        self.default_split_end = default_split_end_curvature
         self.default_split_well_seperation = default_split_well_seperation
         self.default_split_positions = default_split_positions
         self.charge, self.mass = charge, mass
 
+    @cached_property
+    def default_electrodes(self):
+        """Electrodes used by default
+
+        Only fetched from the driver when first needed, and only if no
+        `default_electrode_override` was given."""
+        if self._default_electrode_override is not None:
+            return self._default_electrode_override
+        return self.get_all_electrode_names()
+
+    @property
+    def default_split_positions(self):
+        """Positions where wells are merged by default [in m]"""
+        return self._default_split_positions
+
+    @default_split_positions.setter
+    def default_split_positions(self, positions):
+        self._default_split_positions = np.asarray(positions, dtype=float)
+        self._sorted_split_positions = np.sort(self._default_split_positions, axis=None)
+
+    def _nearest_split_position(self, z):
+        """Return the default split position closest to `z`"""
+        positions = self._sorted_split_positions
+        # only the neighbours of the insertion point can be closest
+        k = np.searchsorted(positions, z)
+        candidates = positions[max(k - 1, 0):k + 1]
+        return float(candidates[np.argmin(np.abs(candidates - z))])
+
     def _mk_waveform(self, volt_vec, el_vec, wells):
         """Create a new waveform object
 
@@ -122,10 +213,9 @@ class SURFMediator:
         :param static_settings: settings for the static solver. User beware!"""
         if electrodes is None:
             electrodes = self.default_electrodes
-        el_names = self.get_all_electrode_names()
 
-        assert set(electrodes).issubset(set(el_names)), \
-            "\n{}\n{}".format(set(electrodes), set(el_names))
+        assert self._all_el_set.issuperset(electrodes), \
+            "\n{}\n{}".format(set(electrodes), set(self._all_el_set))
 
         if z_grid is None:
             z_grid = self.default_z_grid
@@ -133,7 +223,7 @@ class SURFMediator:
         param = {
             "zs": z_grid,
             "electrodes": electrodes,
-            "wells": wells._asdict(),
+            "wells": _wells_dict(wells),
             "static_settings": static_settings
         }
 
@@ -166,12 +256,14 @@ class SURFMediator:
         """Return a list of all electrode names defined in the trap model"""
         return self.driver.get_all_electrode_names()
 
+    @cached_property
+    def _all_el_set(self):
+        """Set of all trap model electrode names, cleared on model (re)load"""
+        return frozenset(self.get_all_electrode_names())
+
     def get_default_electrode_names(self):
         """Return the electrodes used by default"""
-        if self.default_electrodes is None:
-            return self.get_all_electrode_names()
-        else:
-            return self.default_electrodes
+        return self.default_electrodes
 
     def get_z_grid(self, custom_spacing=None):
         """Z grid points with optional custom spacing with same range as user default
@@ -191,9 +283,16 @@ class SURFMediator:
         amplitude such that the sum of square frequencies matches those
         measured experimentally
 
-        :param z: position where the sum of square frequencies is found [in m]
+        :param z: position where the sum of square frequencies is found [in m].
+            May also be an array of positions, in which case an array of the
+            same shape is returned.
         """
-        return self.field_to_f(self.driver.get_div_grad_phi(z))**2
+        z = np.asarray(z, dtype=float)
+        if z.ndim == 0:
+            return self.field_to_f(self.driver.get_div_grad_phi(float(z)))**2
+        div_grad_phi = np.array(
+            [self.driver.get_div_grad_phi(zi) for zi in z.ravel().tolist()])
+        return self.field_to_f(div_grad_phi.reshape(z.shape))**2
 
     def reload_trap_model(self,
                           trap_model_path=None,
@@ -241,6 +340,10 @@ class SURFMediator:
         """
         if mass is not None:
             self.mass = mass
+        # the model might define different electrodes after a reload
+        self.__dict__.pop("_all_el_set", None)
+        if self._default_electrode_override is None:
+            self.__dict__.pop("default_electrodes", None)
         return self.driver.load_config(trap_model_path,
                                        cache_path,
                                        omega_rf,
@@ -344,15 +447,15 @@ class SURFMediator:
         :return: updated waveform"""
         if electrodes is None:
             electrodes = wave.el_vec
-        el_names = wave.el_vec
-
-        assert set(electrodes).issubset(set(el_names)), \
-            "\n{}\n{}".format(set(electrodes), set(el_names))
+        else:
+            assert wave._el_set.issuperset(electrodes), \
+                "\n{}\n{}".format(set(electrodes), set(wave.el_vec))
 
         if z_grid is None:
             z_grid = self.default_z_grid
 
         new_wells = deepcopy(wave.fixed_wells[-1])
+        name_idx = _name_index(new_wells)
         for name, param_dict in change_dict.items():
             if "f_rad_x" in param_dict:
                 param_dict["d2phidradial_h2"] = self.f_to_field(
@@ -360,28 +463,25 @@ class SURFMediator:
             if "f_axial" in param_dict:
                 param_dict["d2phidaxial2"] = self.f_to_field(param_dict.pop("f_axial"))
 
-            idx = new_wells.name.index(name)
+            idx = name_idx[name]
             for param, value in param_dict.items():
-                # exploit mutability of list
+                # exploit mutability of the parameter arrays
                 new_wells._asdict()[param][idx] = value
 
         new_volt, new_el = self._volt_from_wells(new_wells, electrodes, z_grid,
                                                  static_settings)
 
         # dict to pass to do_solve
-        start_volt_dict = {
-            el: wave.voltage_vec_list[-1][idx]
-            for idx, el in enumerate(wave.el_vec)
-        }
+        start_volt_dict = dict(zip(wave.el_vec, wave.voltage_vec_list[-1]))
 
-        end_volt_dict = {el: 0.0 for el in wave.el_vec}
-        end_volt_dict.update({el: new_volt[idx] for idx, el in enumerate(new_el)})
+        end_volt_dict = dict.fromkeys(wave.el_vec, 0.0)
+        end_volt_dict.update(zip(new_el, new_volt))
 
         evol_param = {
             "zs": z_grid,
             "electrodes": tuple(el for el in wave.el_vec),
-            "wells0": wave.fixed_wells[-1]._asdict(),
-            "wells1": new_wells._asdict(),
+            "wells0": _wells_dict(wave.fixed_wells[-1]),
+            "wells1": _wells_dict(new_wells),
             "volt_start": start_volt_dict,
             "volt_end": end_volt_dict,
             "n_step": n_step,
@@ -394,7 +494,7 @@ class SURFMediator:
             el_evol, wave.el_vec)
 
         # append to wave
-        wave.voltage_vec_list.extend([volt_evol[:, i] for i in range(n_step)])
+        wave.voltage_vec_list.extend(np.ascontiguousarray(volt_evol.T))
         wave.fixed_wells.append(new_wells)
         wave.wells_idx.append(len(wave.voltage_vec_list) - 1)
         return wave
@@ -445,10 +545,9 @@ class SURFMediator:
         :return: updated waveform"""
         if electrodes is None:
             electrodes = wave.el_vec
-        el_names = wave.el_vec
-
-        assert set(electrodes).issubset(set(el_names)), \
-            "\n{}\n{}".format(set(electrodes), set(el_names))
+        else:
+            assert wave._el_set.issuperset(electrodes), \
+                "\n{}\n{}".format(set(electrodes), set(wave.el_vec))
 
         if z_grid is None:
             z_grid = self.default_z_grid
@@ -460,12 +559,9 @@ class SURFMediator:
         if well_separation is None:
             well_separation = self.default_split_well_seperation
 
-        spectators = deepcopy(wave.fixed_wells[-1])
-        split_idx = spectators.name.index(name)
-
-        # list.pop() target well
-        target_well = Wells(*([spectators[i].pop(split_idx)]
-                              for i in range(len(spectators))))
+        old_wells = wave.fixed_wells[-1]
+        split_idx = old_wells.name.index(name)
+        target_well, spectators = _pop_well(old_wells, split_idx)
 
         # determine a sensible initial and final split well
         scan_start = deepcopy(target_well)
@@ -482,9 +578,9 @@ class SURFMediator:
         split_params = {
             "electrodes": tuple(el for el in wave.el_vec),
             "zs": z_grid,
-            "scan_start": scan_start._asdict(),
-            "scan_end": scan_end._asdict(),
-            "spectators": spectators._asdict(),
+            "scan_start": _wells_dict(scan_start),
+            "scan_end": _wells_dict(scan_end),
+            "spectators": _wells_dict(spectators),
             "n_step": n_step,
             "n_scan": n_scan,
             "split_settings": split_settings,
@@ -492,32 +588,16 @@ class SURFMediator:
 
         # solve splitting dynamics
         volt_split, split_el, sep_vec = self.driver.split(**split_params)
-        volt_split = [volt_split[:, i] for i in range(n_step)]
+        volt_split = np.ascontiguousarray(volt_split.T)
 
         names = [
             name if out_name0 is None else out_name0,
             (name + "_1") if out_name1 is None else out_name1,
         ]
-        split_wells = Wells(name=names,
-                            z=[
-                                target_well.z[0] - well_separation / 2,
-                                target_well.z[0] + well_separation / 2
-                            ],
-                            width=[target_well.width[0]] * 2,
-                            dphidx=[target_well.dphidx[0]] * 2,
-                            dphidy=[target_well.dphidy[0]] * 2,
-                            dphidz=[target_well.dphidz[0]] * 2,
-                            rx_axial=[target_well.rx_axial[0]] * 2,
-                            ry_axial=[target_well.ry_axial[0]] * 2,
-                            phi_radial=[target_well.phi_radial[0]] * 2,
-                            d2phidaxial2=[target_well.d2phidaxial2[0]] * 2,
-                            d3phidz3=[target_well.d3phidz3[0]] * 2,
-                            d2phidradial_h2=[target_well.d2phidradial_h2[0]] * 2)
+        split_wells = _split_well(target_well, names, well_separation)
 
         # new wells & voltage-set
-        final_wells = Wells(*(spectators[i][:split_idx] + split_wells[i] +
-                              spectators[i][split_idx:]
-                              for i in range(len(split_wells))))
+        final_wells = _insert_wells(spectators, split_idx, split_wells)
         # ToDo: may want to check if there is sufficient space
         final_volt, final_el = self._volt_from_wells(final_wells,
                                                      electrodes=wave.el_vec,
@@ -592,10 +672,9 @@ class SURFMediator:
         :return updated waveform"""
         if electrodes is None:
             electrodes = wave.el_vec
-        el_names = wave.el_vec
-
-        assert set(electrodes).issubset(set(el_names)), \
-            "\n{}\n{}".format(set(electrodes), set(el_names))
+        else:
+            assert wave._el_set.issuperset(electrodes), \
+                "\n{}\n{}".format(set(electrodes), set(wave.el_vec))
 
         if z_grid is None:
             z_grid = self.default_z_grid
@@ -607,21 +686,17 @@ class SURFMediator:
         if well_separation is None:
             well_separation = self.default_split_well_seperation
 
-        spectators = deepcopy(wave.fixed_wells[-1])
-        merge_idx = [spectators.name.index(name0), spectators.name.index(name1)]
+        old_wells = wave.fixed_wells[-1]
+        name_idx = _name_index(old_wells)
+        merge_idx = [name_idx[name0], name_idx[name1]]
 
         # ToDo: assert no wells between wells to be merged
-        target_well = Wells(*([spectators[i][well_idx] for well_idx in merge_idx]
-                              for i in range(len(spectators))))
-
-        spectators = Wells(
-            *([val for i, val in enumerate(spectators[i]) if i not in merge_idx]
-              for i in range(len(spectators))))
+        target_well = Wells(*([col[idx] for idx in merge_idx] for col in old_wells))
+        spectators = _drop_wells(old_wells, merge_idx)
 
         if merge_pos is None:
-            pos_idx = np.argmin(
-                np.abs(np.mean(target_well.z) - self.default_split_positions))
-            merge_pos = self.default_split_positions[pos_idx]
+            merge_pos = self._nearest_split_position(
+                0.5 * (target_well.z[0] + target_well.z[1]))
         # merging is inverse splitting! -> use splitting solver
         # determine a sensible initial and final split well
         scan_start = Wells(
@@ -645,9 +720,9 @@ class SURFMediator:
         split_params = {
             "electrodes": tuple(el for el in wave.el_vec),
             "zs": z_grid,
-            "scan_start": scan_start._asdict(),
-            "scan_end": scan_end._asdict(),
-            "spectators": spectators._asdict(),
+            "scan_start": _wells_dict(scan_start),
+            "scan_end": _wells_dict(scan_end),
+            "spectators": _wells_dict(spectators),
             "n_step": n_step,
             "n_scan": n_scan,
             "split_settings": split_settings,
@@ -655,7 +730,7 @@ class SURFMediator:
 
         # solve splitting dynamics
         volt_merge, merge_el, sep_vec = self.driver.split(**split_params)
-        volt_merge = [volt_merge[:, i] for i in range(n_step - 1, -1, -1)]
+        volt_merge = np.ascontiguousarray(volt_merge[:, ::-1].T)
 
         if prepare_wells:
             # move wells to be separated by one electrode
@@ -676,9 +751,7 @@ class SURFMediator:
         merged_well.d2phidaxial2[0] = np.mean(target_well.d2phidaxial2)
 
         # new wells & voltage-set
-        final_wells = Wells(*(spectators[i][:min(merge_idx)] + merged_well[i] +
-                              spectators[i][min(merge_idx):]
-                              for i in range(len(merged_well))))
+        final_wells = _insert_wells(spectators, min(merge_idx), merged_well)
 
         # ToDo: may want to check if wells cross other wells.
         final_volt, final_el = self._volt_from_wells(final_wells,
@@ -748,10 +821,9 @@ class SURFMediator:
         """
         if electrodes is None:
             electrodes = wave.el_vec
-        el_names = wave.el_vec
-
-        assert set(electrodes).issubset(set(el_names)), \
-            "\n{}\n{}".format(set(electrodes), set(el_names))
+        else:
+            assert wave._el_set.issuperset(electrodes), \
+                "\n{}\n{}".format(set(electrodes), set(wave.el_vec))
 
         if z_grid is None:
             z_grid = self.default_z_grid
@@ -765,12 +837,9 @@ class SURFMediator:
         if well_separation is None:
             well_separation = self.default_split_well_seperation
 
-        spectators = deepcopy(wave.fixed_wells[-1])
-        split_idx = spectators.name.index(name)
-
-        # list.pop() target well
-        target_well = Wells(*([spectators[i].pop(split_idx)]
-                              for i in range(len(spectators))))
+        old_wells = wave.fixed_wells[-1]
+        split_idx = old_wells.name.index(name)
+        target_well, spectators = _pop_well(old_wells, split_idx)
         # determine a sensible initial split well
         target_well.rx_axial[0] = 0.
         target_well.ry_axial[0] = 0.
@@ -782,42 +851,26 @@ class SURFMediator:
         split_params = {
             "electrodes": tuple(el for el in wave.el_vec),
             "zs": z_grid,
-            "split_well": target_well._asdict(),
+            "split_well": _wells_dict(target_well),
             "start_separation": sep_start,
             "end_separation": sep_end,
             "n_step": n_step,
-            "spectators": spectators._asdict(),
+            "spectators": _wells_dict(spectators),
             "split_settings": split_settings,
         }
 
         # solve splitting dynamics
         volt_split, split_el, sep_vec = self.driver.dynamic_split(**split_params)
-        volt_split = [volt_split[:, i] for i in range(n_step)]
+        volt_split = np.ascontiguousarray(volt_split.T)
 
         names = [
             name if out_name0 is None else out_name0,
             (name + "_1") if out_name1 is None else out_name1,
         ]
-        split_wells = Wells(name=names,
-                            z=[
-                                target_well.z[0] - well_separation / 2,
-                                target_well.z[0] + well_separation / 2
-                            ],
-                            width=[target_well.width[0]] * 2,
-                            dphidx=[target_well.dphidx[0]] * 2,
-                            dphidy=[target_well.dphidy[0]] * 2,
-                            dphidz=[target_well.dphidz[0]] * 2,
-                            rx_axial=[target_well.rx_axial[0]] * 2,
-                            ry_axial=[target_well.ry_axial[0]] * 2,
-                            phi_radial=[target_well.phi_radial[0]] * 2,
-                            d2phidaxial2=[target_well.d2phidaxial2[0]] * 2,
-                            d3phidz3=[target_well.d3phidz3[0]] * 2,
-                            d2phidradial_h2=[target_well.d2phidradial_h2[0]] * 2)
+        split_wells = _split_well(target_well, names, well_separation)
 
         # new wells & voltage-set
-        final_wells = Wells(*(spectators[i][:split_idx] + split_wells[i] +
-                              spectators[i][split_idx:]
-                              for i in range(len(split_wells))))
+        final_wells = _insert_wells(spectators, split_idx, split_wells)
         # ToDo: may want to check if there is sufficient space
         final_volt, final_el = self._volt_from_wells(final_wells,
                                                      electrodes=wave.el_vec,
@@ -893,10 +946,9 @@ class SURFMediator:
         :return updated waveform"""
         if electrodes is None:
             electrodes = wave.el_vec
-        el_names = wave.el_vec
-
-        assert set(electrodes).issubset(set(el_names)), \
-            "\n{}\n{}".format(set(electrodes), set(el_names))
+        else:
+            assert wave._el_set.issuperset(electrodes), \
+                "\n{}\n{}".format(set(electrodes), set(wave.el_vec))
 
         if z_grid is None:
             z_grid = self.default_z_grid
@@ -910,21 +962,17 @@ class SURFMediator:
         if well_separation is None:
             well_separation = self.default_split_well_seperation
 
-        spectators = deepcopy(wave.fixed_wells[-1])
-        merge_idx = [spectators.name.index(name0), spectators.name.index(name1)]
+        old_wells = wave.fixed_wells[-1]
+        name_idx = _name_index(old_wells)
+        merge_idx = [name_idx[name0], name_idx[name1]]
 
         # ToDo: assert no wells between wells to be merged
-        target_well = Wells(*([spectators[i][well_idx] for well_idx in merge_idx]
-                              for i in range(len(spectators))))
-
-        spectators = Wells(
-            *([val for i, val in enumerate(spectators[i]) if i not in merge_idx]
-              for i in range(len(spectators))))
+        target_well = Wells(*([col[idx] for idx in merge_idx] for col in old_wells))
+        spectators = _drop_wells(old_wells, merge_idx)
 
         if merge_pos is None:
-            pos_idx = np.argmin(
-                np.abs(np.mean(target_well.z) - self.default_split_positions))
-            merge_pos = self.default_split_positions[pos_idx]
+            merge_pos = self._nearest_split_position(
+                0.5 * (target_well.z[0] + target_well.z[1]))
         # merging is inverse splitting! -> use splitting solver
         # determine a sensible initial and final split well
         split_well = Wells(
@@ -946,17 +994,17 @@ class SURFMediator:
         split_params = {
             "electrodes": tuple(el for el in wave.el_vec),
             "zs": z_grid,
-            "split_well": split_well._asdict(),
+            "split_well": _wells_dict(split_well),
             "start_separation": sep_start,
             "end_separation": sep_end,
             "n_step": n_step,
-            "spectators": spectators._asdict(),
+            "spectators": _wells_dict(spectators),
             "split_settings": split_settings,
         }
 
         # solve splitting dynamics
         volt_merge, merge_el, sep_vec = self.driver.dynamic_split(**split_params)
-        volt_merge = [volt_merge[:, i] for i in range(n_step - 1, -1, -1)]
+        volt_merge = np.ascontiguousarray(volt_merge[:, ::-1].T)
 
         if prepare_wells:
             # move wells to be separated by one electrode
@@ -977,9 +1025,7 @@ class SURFMediator:
         merged_well.d2phidaxial2[0] = np.mean(target_well.d2phidaxial2)
 
         # new wells & voltage-set
-        final_wells = Wells(*(spectators[i][:min(merge_idx)] + merged_well[i] +
-                              spectators[i][min(merge_idx):]
-                              for i in range(len(merged_well))))
+        final_wells = _insert_wells(spectators, min(merge_idx), merged_well)
 
         # ToDo: may want to check if wells cross other wells.
         final_volt, final_el = self._volt_from_wells(final_wells,
@@ -1037,13 +1083,24 @@ class SURFMediator:
 
         :param z_grid: z-grid on which to perform optimisation. If `None` SURF
             will use the default grid."""
-        old_wells = wave.fixed_wells[-1]
+        self.spawn_wells_many([dict(kwargs, z=z)], wave, n_step, z_grid=z_grid)
+
+    def spawn_wells_many(self, well_kwargs, wave, n_step=5, *, z_grid=None):
+        """Spawn several groups of new wells in a waveform at once
+
+        Equivalent to calling :meth:`spawn_wells` for each group in turn, but
+        all wells appear together and the solver is only called once.
+
+        :param well_kwargs: list of dicts, each holding the keyword arguments
+            (including `z`) that :meth:`spawn_wells` would take for one group.
+        :param wave: waveform to modify. Modified in place!
+        :param n_step: number of interpolation steps to the new wells.
+        :param z_grid: z-grid on which to perform optimisation. If `None` SURF
+            will use the default grid."""
         old_volt = wave.voltage_vec_list[-1]
 
-        tmp_wells = self._mk_wells(z, **kwargs)
-        new_wells = deepcopy(old_wells)
-        new_wells = Wells(*[[*new_wells[i], *tmp_wells[i]]
-                            for i in range(len(new_wells))])
+        new_wells = _concat_wells(wave.fixed_wells[-1],
+                                  *(self._mk_wells(**kwargs) for kwargs in well_kwargs))
 
         new_volt, el = self._volt_from_wells(new_wells, wave.el_vec, z_grid)
         v_steps = self._interpolate(old_volt, new_volt, n_step)
@@ -1057,8 +1114,10 @@ class SURFMediator:
         Assumes electrode ordering in both voltage vectors is identical.
 
         May be used to connect different (similar) waveforms or
-        evolve to/from non SURF voltages"""
-        return [volt0 + (volt1 - volt0) * t for t in np.linspace(0, 1, n_step)]
+        evolve to/from non SURF voltages
+
+        :returns: array of shape (n_step, <number of electrodes>)"""
+        return self._ramp(volt0, volt1, np.linspace(0, 1, n_step))
 
     def _poly_interpolate(self, volt0, volt1, n_step):
         """Smoothly evolve between 2 voltage vectors.
@@ -1070,28 +1129,39 @@ class SURFMediator:
         (Inspired by H Kaufmann et al 2014 New J. Phys. 16 073012)
 
         Assumes electrode ordering in both voltage vectors is identical.
+
+        :returns: array of shape (n_step, <number of electrodes>)
         """
-        return [
-            volt0 + (volt1 - volt0) * (10 * t**3 - 15 * t**4 + 6 * t**5)
-            for t in np.linspace(0, 1, n_step)
-        ]
+        t = np.linspace(0, 1, n_step)
+        return self._ramp(volt0, volt1, 10 * t**3 - 15 * t**4 + 6 * t**5)
+
+    @staticmethod
+    def _ramp(volt0, volt1, weights):
+        """Evaluate `volt0 + (volt1 - volt0) * w` for each w in `weights`
+
+        The whole ramp is written into one preallocated array rather than
+        creating temporaries for each step."""
+        volt0 = np.asarray(volt0, dtype=float)
+        out = np.multiply.outer(weights, np.asarray(volt1, dtype=float) - volt0)
+        out += volt0
+        return out
 
     def f_to_field(self, frequency):
         "convert mode frequency to field curvature"
-        return (self.mass * const("atomic mass constant") /
-                (self.charge * const("atomic unit of charge")) *
-                (2 * np.pi * frequency)**2)
+        # same order of operations as before the constants were cached, so that
+        # the driver's solution cache keys do not change
+        mass_charge = self.mass * _ATOMIC_MASS / (self.charge * _ELEMENTARY_CHARGE)
+        return mass_charge * (2 * np.pi * np.asarray(frequency))**2
 
     def field_to_f(self, field_curvature):
         "convert field curvature to mode frequency"
-        return np.sqrt(field_curvature * self.charge * const("atomic unit of charge") /
-                       (self.mass * const("atomic mass constant"))) / (2 * np.pi)
+        return np.sqrt(field_curvature * self.charge * _ELEMENTARY_CHARGE /
+                       (self.mass * _ATOMIC_MASS)) / (2 * np.pi)
 
     def field_to_two_ion_sep(self, field_curvature):
         """Convert field curvature to two-ion separation"""
-        eps_4pi = 4 * np.pi * const("vacuum electric permittivity")
-        q = self.charge * const("atomic unit of charge")
-        return (q / (eps_4pi * field_curvature))**(1 / 3)
+        q = self.charge * _ELEMENTARY_CHARGE
+        return (q / (_EPS0_4PI * field_curvature))**(1 / 3)
 
     def _mk_wells(self,
                   z,
@@ -1144,42 +1214,21 @@ class SURFMediator:
         if f_rad_x is None:
             f_rad_x = self.default_f_rad_x
 
-        if not isinstance(z, Iterable):
-            z = [
-                z,
-            ]
-        else:
-            z = [i for i in z]
-
-        if not isinstance(f_axial, Iterable):
-            f_axial = [f_axial for i in z]
-        d2phidaxial2 = [self.f_to_field(i) for i in f_axial]
-        if not isinstance(f_rad_x, Iterable):
-            f_rad_x = [f_rad_x for i in z]
-        d2phidradial_h2 = [self.f_to_field(i) for i in f_rad_x]
-
-        if not isinstance(width, Iterable):
-            width = [width for i in z]
-        if not isinstance(dphidx, Iterable):
-            dphidx = [dphidx for i in z]
-        if not isinstance(dphidy, Iterable):
-            dphidy = [dphidy for i in z]
-        if not isinstance(dphidz, Iterable):
-            dphidz = [dphidz for i in z]
-
-        if not isinstance(rx_axial, Iterable):
-            rx_axial = [rx_axial for i in z]
-        if not isinstance(ry_axial, Iterable):
-            ry_axial = [ry_axial for i in z]
-        if not isinstance(phi_radial, Iterable):
-            phi_radial = [phi_radial for i in z]
-        if not isinstance(d3phidz3, Iterable):
-            d3phidz3 = [d3phidz3 for i in z]
+        z = np.atleast_1d(np.asarray(z, dtype=float))
+
+        # one row per parameter, scalars are broadcast across all wells
+        cols = np.array([
+            np.broadcast_to(np.asarray(param, dtype=float), z.shape)
+            for param in (z, width, dphidx, dphidy, dphidz, rx_axial, ry_axial,
+                          phi_radial, d3phidz3, f_axial, f_rad_x)
+        ])
+        cols[-2:] = self.f_to_field(cols[-2:])
+        (z, width, dphidx, dphidy, dphidz, rx_axial, ry_axial, phi_radial, d3phidz3,
+         d2phidaxial2, d2phidradial_h2) = cols
 
         if name is None:
-            name = [str(i) for i in range(len(z))]
-        else:
-            [n if n is not None else str(i) for i, n in enumerate(name)]
+            name = [None] * len(z)
+        name = [str(i) if n is None else n for i, n in enumerate(name)]
 
         return Wells(name, z, width, dphidx, dphidy, dphidz, rx_axial, ry_axial,
                      phi_radial, d2phidaxial2, d3phidz3, d2phidradial_h2)
@@ -6,12 +6,15 @@ import logging
 import asyncio
 from collections import deque, namedtuple
 from enum import Enum
+from itertools import islice
 
 # Based on hirshmann pid-autotune libiary
 # See https://github.com/hirschmann/pid-autotune
 # Which is in turn based on a fork of Arduino PID AutoTune Library
 # See https://github.com/t0mpr1c3/Arduino-PID-AutoTune-Library
 
+logger = logging.getLogger(__name__)
+
 
 class PIDAutotuneState(Enum):
     STATE_OFF = 'off'
@@ -47,7 +50,12 @@ class PIDAutotune:
         if setpoint is None:
             raise ValueError('setpoint must be specified')
 
-        self._inputs = deque(maxlen=round(lookback / sampletime))
+        # extrema of the last `_lookback_len` inputs are tracked in monotonic
+        # deques of (sample index, value), so run() never rescans the window
+        self._lookback_len = round(lookback / sampletime)
+        self._input_count = 0
+        self._window_max = deque()
+        self._window_min = deque()
         self._setpoint = setpoint
         self._outputstep = out_step
         self._noiseband = noiseband
@@ -57,6 +65,8 @@ class PIDAutotune:
         self._state = PIDAutotuneState.STATE_OFF
         self._peak_timestamps = deque(maxlen=5)
         self._peaks = deque(maxlen=5)
+        # absolute differences between consecutive entries of _peaks
+        self._peak_diffs = deque(maxlen=4)
         self._output = 0
         self._last_run_timestamp = 0
         self._peak_type = 0
@@ -84,11 +94,48 @@ class PIDAutotune:
             tuning_rule (str): Sets the rule which should be used to calculate
                 the parameters.
         """
-        divisors = self._tuning_rules[tuning_rule]
-        kp = self._Ku * divisors[0]
-        ki = divisors[1] * self._Ku / self._Pu
-        kd = divisors[2] * self._Ku * self._Pu
-        return PIDAutotune.PIDParams(kp, ki, kd)
+        return self.get_all_pid_parameters()[tuning_rule]
+
+    def get_all_pid_parameters(self):
+        """Get PID parameters for all tuning rules.
+
+        Returns:
+            dict mapping each tuning rule name to its `PIDParams`.
+        """
+        ku, pu = self._Ku, self._Pu
+        gains = (ku, ku / pu, ku * pu)
+        return {
+            rule: PIDAutotune.PIDParams(*(d * g for d, g in zip(divisors, gains)))
+            for rule, divisors in self._tuning_rules.items()
+        }
+
+    def _update_window(self, input_val):
+        """Add `input_val` to the lookback window.
+
+        Returns:
+            (is_max, is_min): whether `input_val` is at least as large (small)
+            as all previous inputs in the window.
+        """
+        idx = self._input_count
+        oldest = idx - self._lookback_len
+        window_max, window_min = self._window_max, self._window_min
+        while window_max and window_max[0][0] < oldest:
+            window_max.popleft()
+        while window_min and window_min[0][0] < oldest:
+            window_min.popleft()
+
+        is_max = not window_max or input_val >= window_max[0][1]
+        is_min = not window_min or input_val <= window_min[0][1]
+
+        while window_max and window_max[-1][1] <= input_val:
+            window_max.pop()
+        window_max.append((idx, input_val))
+        while window_min and window_min[-1][1] >= input_val:
+            window_min.pop()
+        window_min.append((idx, input_val))
+
+        self._input_count += 1
+        return is_max, is_min
 
     def run(self, input_val, time_input):
         """To autotune a system, this method must be called periodically.
@@ -113,13 +160,13 @@ class PIDAutotune:
         if (self._state == PIDAutotuneState.STATE_RELAY_STEP_UP
                 and input_val > self._setpoint + self._noiseband):
             self._state = PIDAutotuneState.STATE_RELAY_STEP_DOWN
-            logging.debug('switched state: {0}'.format(self._state))
-            logging.debug('input: {0}'.format(input_val))
+            logger.debug('switched state: %s', self._state)
+            logger.debug('input: %s', input_val)
         elif (self._state == PIDAutotuneState.STATE_RELAY_STEP_DOWN
               and input_val < self._setpoint - self._noiseband):
             self._state = PIDAutotuneState.STATE_RELAY_STEP_UP
-            logging.debug('switched state: {0}'.format(self._state))
-            logging.debug('input: {0}'.format(input_val))
+            logger.debug('switched state: %s', self._state)
+            logger.debug('input: %s', input_val)
 
         # set output
         if (self._state == PIDAutotuneState.STATE_RELAY_STEP_UP):
@@ -132,17 +179,10 @@ class PIDAutotune:
         self._output = max(self._output, self._out_min)
 
         # identify peaks
-        is_max = True
-        is_min = True
-
-        for val in self._inputs:
-            is_max = is_max and (input_val >= val)
-            is_min = is_min and (input_val <= val)
-
-        self._inputs.append(input_val)
+        is_max, is_min = self._update_window(input_val)
 
         # we don't trust the maxes or mins until the input array is full
-        if len(self._inputs) < self._inputs.maxlen:
+        if self._input_count < self._lookback_len:
             return False
 
         # increment peak count and record peak time for maxima and minima
@@ -163,31 +203,31 @@ class PIDAutotune:
         # update peak times and values
         if inflection:
             self._peak_count += 1
+            if self._peaks:
+                self._peak_diffs.append(abs(self._peaks[-1] - input_val))
             self._peaks.append(input_val)
             self._peak_timestamps.append(now)
-            logging.debug('found peak: {0}'.format(input_val))
-            logging.debug('peak count: {0}'.format(self._peak_count))
+            logger.debug('found peak: %s', input_val)
+            logger.debug('peak count: %s', self._peak_count)
 
         # check for convergence of induced oscillation
         # convergence of amplitude assessed on last 4 peaks (1.5 cycles)
         self._induced_amplitude = 0
 
         if inflection and (self._peak_count > 4):
-            abs_max = self._peaks[-2]
-            abs_min = self._peaks[-2]
-            for i in range(0, len(self._peaks) - 2):
-                self._induced_amplitude += abs(self._peaks[i] - self._peaks[i + 1])
-                abs_max = max(self._peaks[i], abs_max)
-                abs_min = min(self._peaks[i], abs_min)
-
-            self._induced_amplitude /= 6.0
+            # uses the four peaks preceding the one just found
+            diffs = self._peak_diffs
+            self._induced_amplitude = (diffs[0] + diffs[1] + diffs[2]) / 6.0
+            previous = list(islice(self._peaks, 4))
+            abs_max = max(previous)
+            abs_min = min(previous)
 
             # check convergence criterion for amplitude of induced oscillation
             amplitude_dev = ((0.5 * (abs_max - abs_min) - self._induced_amplitude) /
                              self._induced_amplitude)
 
-            logging.debug('amplitude: {0}'.format(self._induced_amplitude))
-            logging.debug('amplitude deviation: {0}'.format(amplitude_dev))
+            logger.debug('amplitude: %s', self._induced_amplitude)
+            logger.debug('amplitude deviation: %s', amplitude_dev)
 
             if amplitude_dev < PIDAutotune.PEAK_AMPLITUDE_TOLERANCE:
                 self._state = PIDAutotuneState.STATE_SUCCEEDED
@@ -201,7 +241,7 @@ class PIDAutotune:
 
         if self._state == PIDAutotuneState.STATE_SUCCEEDED:
             self._output = 0
-            logging.debug('peak finding successful')
+            logger.debug('peak finding successful')
 
             # calculate ultimate gain
             self._Ku = 4.0 * self._outputstep / \
@@ -214,15 +254,14 @@ class PIDAutotune:
             self._Pu = 0.5 * (period1 + period2) / 1000.0
             print('Pu: {0}'.format(self._Pu))
 
-            for rule in self._tuning_rules:
-                params = self.get_pid_parameters(rule)
+            for rule, params in self.get_all_pid_parameters().items():
                 print('rule: {0}'.format(rule))
                 print('Kp: {0}'.format(params.Kp))
                 print('Ki: {0}'.format(params.Ki))
                 print('Kd: {0}'.format(params.Kd))
 
-            logging.info("Use the controller's 'set_param()' method to update the PID "
-                         "parameters.")
+            logger.info("Use the controller's 'set_param()' method to update the PID "
+                        "parameters.")
             return True
         return False
 
@@ -3,10 +3,15 @@ https://git.m-labs.hk/M-Labs/thermostat/src/branch/master/pytec/pytec/client.py
 """
 
 import socket
-import json
 import logging
 import asyncio
 
+try:
+    # Considerably faster at decoding the report stream, but optional
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 
 class CommandError(Exception):
     pass
@@ -36,35 +41,50 @@ class _ReportMode:
         return self
 
     def __exit__(self, exc_type, exc_value, exc_tb):
+        # receive_continuously() may have left the socket non-blocking if it was
+        # not run to completion
+        self._dev._socket.settimeout(self._dev._timeout)
         self._dev._command("report mode", "off")
-        # FLush out any reports that may still be in the buffer.
-        surplus = 0
+        # Flush out any reports that may still be in the buffer: request the
+        # postfilter configuration once and discard everything up to its reply.
+        self._dev._socket.sendall(b"postfilter\n")
         while True:
-            msg = self._dev.get_postfilter()[0]
-            if msg is None or "rate" not in msg:
-                surplus += 1
-            else:
-                break
-        for i in range(surplus):
-            self._dev._read_line()
+            line = self._dev._read_raw_line()
+            if line is None:
+                return
+            try:
+                msg = _json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(msg, list) and msg and "rate" in msg[0]:
+                return
 
     async def receive_continuously(self):
-        while True:
-            line = self._dev._read_line()
-            if not line:
-                break
-            try:
-                yield json.loads(line)
-            except json.decoder.JSONDecodeError:
-                pass
-            await asyncio.sleep(0)
+        sock = self._dev._socket
+        # Reports are awaited on the event loop itself, which needs the socket
+        # to be non-blocking. Nothing is left reading once this is cancelled.
+        sock.setblocking(False)
+        try:
+            while True:
+                line = await self._dev._aread_raw_line()
+                if not line:
+                    break
+                try:
+                    yield _json.loads(line)
+                except ValueError:
+                    # JSONDecodeError, or invalid UTF-8 when decoding with json
+                    pass
+        finally:
+            sock.settimeout(self._dev._timeout)
 
 
 class Thermostat:
 
     def __init__(self, host, port=23, timeout=10):
         self._socket = socket.create_connection((host, port), timeout)
-        self._lines = [""]
+        self._timeout = timeout
+        # Received bytes not yet returned as a line
+        self._rxbuf = bytearray()
         self._check_zero_limits()
         self.report_mode = _ReportMode(self)
 
@@ -76,34 +96,83 @@ class Thermostat:
                     logging.warning("`{}` limit is set to zero on channel {}".format(
                         limit, pwm_channel["channel"]))
 
-    def _read_line(self):
-        # read more lines
-        while len(self._lines) <= 1:
+    def _pop_line(self):
+        """Remove the first complete line from the receive buffer and return it
+        without the trailing newline, or return None if there is none yet"""
+        rxbuf = self._rxbuf
+        end = rxbuf.find(b"\n")
+        if end < 0:
+            return None
+        line = bytes(rxbuf[:end])
+        del rxbuf[:end + 1]
+        return line
+
+    def _read_raw_line(self):
+        """Read one line as bytes, without the trailing newline
+
+        Returns None if the connection was closed. Partial lines stay buffered
+        across socket timeouts."""
+        line = self._pop_line()
+        while line is None:
             chunk = self._socket.recv(4096)
             if not chunk:
                 return None
-            buf = self._lines[-1] + chunk.decode('utf-8', errors='ignore')
-            self._lines = buf.split("\n")
+            self._rxbuf += chunk
+            line = self._pop_line()
+        return line
 
-        line = self._lines[0]
-        self._lines = self._lines[1:]
+    async def _aread_raw_line(self):
+        """Like `_read_raw_line()`, but awaiting data on the running event loop
+
+        The socket must be non-blocking. Cancelling this loses no data."""
+        loop = asyncio.get_running_loop()
+        line = self._pop_line()
+        while line is None:
+            chunk = await loop.sock_recv(self._socket, 4096)
+            if not chunk:
+                return None
+            self._rxbuf += chunk
+            line = self._pop_line()
         return line
 
+    def _read_line(self):
+        line = self._read_raw_line()
+        if line is None:
+            return None
+        return line.decode('utf-8', errors='ignore')
+
     def _command(self, *command):
         self._socket.sendall((" ".join(command).strip() + "\n").encode('utf-8'))
 
-        line = self._read_line()
-        response = json.loads(line)
+        response = _json.loads(self._read_raw_line())
         if "error" in response:
             raise CommandError(response["error"])
         return response
 
-    def _get_conf(self, topic):
+    @staticmethod
+    def _by_channel(response):
         result = [None, None]
-        for item in self._command(topic):
+        for item in response:
             result[int(item["channel"])] = item
         return result
 
+    def _get_conf(self, topic):
+        return self._by_channel(self._command(topic))
+
+    def _multi_get_conf(self, *topics):
+        """Retrieve several configuration topics in a single round-trip
+
+        All requests are sent at once, then the replies are read back in order.
+        """
+        self._socket.sendall(("\n".join(topics) + "\n").encode('utf-8'))
+
+        # Read every reply before raising, so none are left in the buffer
+        responses = [_json.loads(self._read_raw_line()) for _ in topics]
+        for response in responses:
+            if "error" in response:
+                raise CommandError(response["error"])
+        return [self._by_channel(response) for response in responses]
+
     def ping(self):
         read = self.get_pid()
         if read is not None:
@@ -195,6 +264,15 @@ class Thermostat:
         """
         return self._get_conf("report")
 
+    def snapshot(self):
+        """Retrieve all configuration and the current status in one go
+
+        Returns a dict with the keys "pwm", "pid", "s-h", "postfilter" and
+        "report", each holding the same data as the corresponding getter.
+        """
+        topics = ("pwm", "pid", "s-h", "postfilter", "report")
+        return dict(zip(topics, self._multi_get_conf(*topics)))
+
     def set_param(self, topic, channel, field="", value=""):
         """Set configuration parameters
 
@@ -207,11 +285,9 @@ class Thermostat:
 
         See the firmware's README.md for a full list.
         """
-        if type(value) is float:
-            value = "{:f}".format(value)
-        if type(value) is not str:
-            value = str(value)
-        self._command(topic, str(channel), field, value)
+        if isinstance(value, float):
+            value = format(value, "f")
+        self._command(f"{topic} {channel} {field} {value}")
 
     def power_up(self, channel, target):
         """Start closed-loop mode"""
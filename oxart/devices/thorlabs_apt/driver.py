@@ -1,13 +1,30 @@
 import serial
 import struct
-import time
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
 
+from oxart.devices.streams import ReadBuffer, enable_low_latency
+
 logger = logging.getLogger(__name__)
 
 # See https://www.thorlabs.com/Software/Motion%20Control/APT_Communications_Protocol.pdf
 
+# Precompiled layouts of the fixed-format messages and payloads
+_MSG_HDR = struct.Struct("<HBBBB")
+_MSG_DATA_HDR = struct.Struct("<HHBB")
+_LEN = struct.Struct("<H")
+_STATUS = struct.Struct("=HiHHI")
+_HOME = struct.Struct("<HHHii")
+_VEL = struct.Struct("<Hiii")
+_MOVE = struct.Struct("<Hi")
+# Complete move message: data header followed by the move payload
+_MOVE_MSG = struct.Struct("<HHBBHi")
+_POWER = struct.Struct("<HHH")
+_HWINFO = struct.Struct("=l8sH4B48s12sHHH")
+
 
 class MGMSG(IntEnum):
     HW_DISCONNECT = 0x0002
@@ -129,6 +146,11 @@ class MGMSG(IntEnum):
     RESTOREFACTORYSETTINGS = 0x0686
 
 
+# Lookup of message ids without going through the enum constructor. Unknown ids
+# are kept as plain ints instead of raising.
+_MGMSG_MAP = {m.value: m for m in MGMSG}
+
+
 class SRC_DEST(IntEnum):
     HOST_CONTROLLER = 0x01
     RACK_CONTROLLER = 0x11
@@ -162,6 +184,10 @@ class Status(IntEnum):
               | JOGGING_FORWARD | JOGGING_REVERSE)
 
 
+# Plain-int copy of the mask, to test status words without enum attribute lookups
+_MOVING_MASK = int(Status.MOVING)
+
+
 class Direction(IntEnum):
     FORWARD = 1
     REVERSE = 2
@@ -177,6 +203,7 @@ class MsgError(Exception):
 
 
 class Message:
+    __slots__ = ("_id", "param1", "param2", "dest", "src", "data")
 
     def __init__(self,
                  _id,
@@ -185,8 +212,7 @@ class Message:
                  dest=SRC_DEST.GENERIC_USB_HW.value,
                  src=SRC_DEST.HOST_CONTROLLER.value,
                  data=None):
-        if data is not None:
-            dest |= 0x80
+        dest |= (data is not None) << 7
         self._id = _id
         self.param1 = param1
         self.param2 = param2
@@ -201,23 +227,43 @@ class Message:
 
     @staticmethod
     def unpack(data):
-        _id, param1, param2, dest, src = struct.unpack("<HBBBB", data[:6])
-        data = data[6:]
+        _id, param1, param2, dest, src = _MSG_HDR.unpack_from(data)
         if dest & 0x80:
-            if data and len(data) != param1 | (param2 << 8):
+            # param1 and param2 form the little-endian payload length
+            (length, ) = _LEN.unpack_from(data, 2)
+            data = bytes(data[6:])
+            if data and len(data) != length:
                 raise ValueError("If data are provided, param1 and param2"
                                  " should contain the data length")
         else:
             data = None
-        return Message(MGMSG(_id), param1, param2, dest, src, data)
+        return Message(_MGMSG_MAP.get(_id, _id), param1, param2, dest, src, data)
+
+    @classmethod
+    def unpack_from(cls, buf, offset=0):
+        """Build the message starting at `offset` in `buf` in a single step
+
+        Unlike `unpack()`, the buffer may hold further bytes after the message,
+        and the payload length is taken from the header without validation."""
+        self = cls.__new__(cls)
+        _id, self.param1, self.param2, dest, self.src = _MSG_HDR.unpack_from(
+            buf, offset)
+        self._id = _MGMSG_MAP.get(_id, _id)
+        self.dest = dest
+        if dest & 0x80:
+            end = offset + 6 + (self.param1 | (self.param2 << 8))
+            self.data = bytes(buf[offset + 6:end])
+        else:
+            self.data = None
+        return self
 
     def pack(self):
         if self.has_data:
-            return struct.pack("<HHBB", self._id.value, len(self.data),
-                               self.dest | 0x80, self.src) + self.data
+            return _MSG_DATA_HDR.pack(self._id, len(self.data), self.dest,
+                                      self.src) + self.data
         else:
-            return struct.pack("<HBBBB", self._id.value, self.param1, self.param2,
-                               self.dest, self.src)
+            return _MSG_HDR.pack(self._id, self.param1, self.param2, self.dest,
+                                 self.src)
 
     @property
     def has_data(self):
@@ -231,121 +277,344 @@ class Message:
             raise ValueError
 
 
+# Messages the device sends unprompted to report progress, and error reports
+_STATUS_UPDATE_IDS = frozenset({
+    MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED, MGMSG.MOT_MOVE_HOMED,
+    MGMSG.MOT_GET_DCSTATUSUPDATE
+})
+_ERROR_IDS = frozenset({MGMSG.HW_DISCONNECT, MGMSG.HW_RESPONSE, MGMSG.HW_RICHRESPONSE})
+
+# Replies ending a move or homing
+_MOVE_END_IDS = frozenset({MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED})
+_HOME_END_IDS = frozenset({MGMSG.MOT_MOVE_HOMED, MGMSG.MOT_MOVE_STOPPED})
+
+# Messages without parameters or data never change, so are packed only once
+_IDENTIFY_MSG = Message(MGMSG.MOD_IDENTIFY).pack()
+_SUSPEND_END_OF_MOVE_MSG = Message(MGMSG.MOT_SUSPEND_ENDOFMOVEMSGS).pack()
+_RESUME_END_OF_MOVE_MSG = Message(MGMSG.MOT_RESUME_ENDOFMOVEMSGS).pack()
+_ACK_STATUS_MSG = Message(MGMSG.MOT_ACK_DCSTATUSUPDATE).pack()
+_STOP_MSG = Message(MGMSG.MOT_MOVE_STOP).pack()
+
+
+def _build_move(msg_id, position, channel=0):
+    """Pack a complete absolute or relative move message in one go"""
+    return _MOVE_MSG.pack(msg_id, _MOVE.size, SRC_DEST.GENERIC_USB_HW | 0x80,
+                          SRC_DEST.HOST_CONTROLLER, channel, position)
+
+
 class _APTDevice:
 
     def __init__(self, port):
         self.h = serial.Serial(port, 115200, write_timeout=0.1)
+        enable_low_latency(self.h)
+        # bound once, as every message goes through this
+        self._write = self.h.write
         self._status_update_counter = 0
+        # Reads raise TimeoutError only while `_wait_for_message()` has set a
+        # timeout on the port
+        self._rx = ReadBuffer(self.h)
+        # Held for every exchange with the device, i.e. a command together with
+        # the replies it waits for, so that callers in different threads cannot
+        # take each other's replies. Reentrant, as exchanges may ack status
+        # updates.
+        self._lock = threading.RLock()
+        # Held for each write, so that stop() can write while another thread
+        # holds _lock
+        self._write_lock = threading.Lock()
+        # End-of-move message ids still owed by a move whose wait timed out
+        self._pending_end_ids = None
+        # Runs the blocking calls behind the *_async methods, created on first use
+        self._executor = None
 
     def _send_message(self, message):
-        msg = message.pack()
-        logger.debug("Sending: {}".format(message))
-        logger.debug("tx: {}".format(msg.hex()))
-        self.h.write(msg)
+        logger.debug("Sending: %s", message)
+        self._write_message(message.pack())
+
+    def _send_batch(self, *messages):
+        """Send several messages that need no reply in a single write"""
+        if logger.isEnabledFor(logging.DEBUG):
+            for message in messages:
+                logger.debug("Sending: %s", message)
+        self._write_message(b"".join(message.pack() for message in messages))
+
+    def _write_message(self, msg):
+        """Write an already packed message"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("tx: %s", msg.hex())
+        with self._lock, self._write_lock:
+            self._write(msg)
+
+    def _buffer_message(self):
+        """Buffer the next complete message
+
+        Returns the message's offset and size in the receive buffer."""
+        rx = self._rx
+        rx.ensure(6)
+        rxbuf, pos = rx.data, rx.pos
+        size = 6
+        if rxbuf[pos + 4] & 0x80:
+            size += int.from_bytes(rxbuf[pos + 2:pos + 4], "little")
+            rx.ensure(size)
+        return pos, size
 
     def _read_message(self):
-        header = self.h.read(6)
-        data = b""
-        if header[4] & 0x80:
-            (length, ) = struct.unpack("<H", header[2:4])
-            data = self.h.read(length)
-        msg = Message.unpack(header + data)
-        logger.debug("rx: {}{}".format(header.hex(), data.hex()))
-        logger.debug("Received: {}".format(msg))
+        pos, size = self._buffer_message()
+        rxbuf = self._rx.data
+        msg = Message.unpack_from(rxbuf, pos)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("rx: %s", rxbuf[pos:pos + size].hex())
+            logger.debug("Received: %s", msg)
+        self._rx.consume(size)
         return msg
 
-    def _send_request(self, msgreq_id, wait_for, param1=0, param2=0, data=None):
-        self._send_message(Message(msgreq_id, param1, param2, data=data))
+    def _send_request(self,
+                      msgreq_id,
+                      wait_for,
+                      param1=0,
+                      param2=0,
+                      data=None,
+                      timeout=None):
+        with self._lock:
+            self._send_message(Message(msgreq_id, param1, param2, data=data))
+            return self._wait_for_message(wait_for, timeout)
+
+    def _wait_for_message(self, wait_for, timeout=None):
+        """Read messages until one of the ids in `wait_for` arrives, returning it
+
+        If `timeout` (in s) is given, raises TimeoutError if it has not arrived
+        by then."""
+        if timeout is None:
+            return self._wait_for_message_until(wait_for, None)
+        try:
+            return self._wait_for_message_until(wait_for, time.monotonic() + timeout)
+        finally:
+            self.h.timeout = None
+
+    def _wait_for_message_until(self, wait_for, deadline):
         while True:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timeout while waiting for a message")
+                self.h.timeout = remaining
+            pos, size = self._buffer_message()
+            rxbuf = self._rx.data
+            msg_id = int.from_bytes(rxbuf[pos:pos + 2], "little")
+            if msg_id not in wait_for and msg_id not in _ERROR_IDS:
+                # Messages nobody is waiting for are at most counted, so skip
+                # building a Message for them
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("rx: %s", rxbuf[pos:pos + size].hex())
+                self._rx.consume(size)
+                if msg_id in _STATUS_UPDATE_IDS:
+                    self._status_update_counter += 1
+                    self._flush_status()
+                    self._drain_status_updates(wait_for)
+                continue
+
             msg = self._read_message()
             self._triage_message(msg)
 
             if msg._id in wait_for:
                 return msg
 
+    def _drain_status_updates(self, wait_for):
+        """Consume the status updates already buffered back-to-back, other than
+        those in `wait_for`, in a single pass
+
+        Stops at the first other or incomplete message. Unlike going round
+        `_wait_for_message_until()` for each, this neither reads from nor
+        reconfigures the port. Each update is counted towards the ack as usual."""
+        rx = self._rx
+        rxbuf, pos = rx.data, rx.pos
+        end = len(rxbuf)
+        while end - pos >= 6:
+            msg_id = int.from_bytes(rxbuf[pos:pos + 2], "little")
+            if msg_id not in _STATUS_UPDATE_IDS or msg_id in wait_for:
+                break
+            size = 6
+            if rxbuf[pos + 4] & 0x80:
+                size += int.from_bytes(rxbuf[pos + 2:pos + 4], "little")
+            if end - pos < size:
+                break
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("rx: %s", rxbuf[pos:pos + size].hex())
+            pos += size
+            self._status_update_counter += 1
+            self._flush_status()
+        rx.consume(pos - rx.pos)
+
+    def _send_and_wait_one(self, msgreq_id, reply_id, param1=0):
+        """Specialisation of `_send_request()` for requests without data
+        awaiting a single reply type"""
+        with self._lock:
+            self._write_message(
+                _MSG_HDR.pack(msgreq_id, param1, 0, SRC_DEST.GENERIC_USB_HW,
+                              SRC_DEST.HOST_CONTROLLER))
+            return self._wait_for_message((reply_id, ))
+
     def _triage_message(self, msg):
         """Triage an incoming message in case of errors or action required"""
         msg_id = msg._id
-        data = msg.data
-
-        if msg_id == MGMSG.HW_DISCONNECT:
-            raise MsgError("Error: Please disconnect")
-        elif msg_id == MGMSG.HW_RESPONSE:
-            raise MsgError("Hardware error, please disconnect")
-        elif msg_id == MGMSG.HW_RICHRESPONSE:
-            (code, ) = struct.unpack("<H", data[2:4])
-            raise MsgError("Hardware error {}: {}".format(
-                code, data[4:].decode(encoding="ascii")))
-        elif msg_id in [
-                MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED, MGMSG.MOT_MOVE_HOMED,
-                MGMSG.MOT_GET_DCSTATUSUPDATE
-        ]:
+
+        if msg_id in _STATUS_UPDATE_IDS:
             self._status_update_counter += 1
-            if self._status_update_counter > 25:
-                logger.debug("Acking status updates")
-                self._status_update_counter = 0
-                self.ack_status_update()
+            self._flush_status()
+        elif msg_id in _ERROR_IDS:
+            if msg_id == MGMSG.HW_DISCONNECT:
+                raise MsgError("Error: Please disconnect")
+            elif msg_id == MGMSG.HW_RESPONSE:
+                raise MsgError("Hardware error, please disconnect")
+            else:
+                data = msg.data
+                code = int.from_bytes(data[2:4], "little")
+                raise MsgError("Hardware error {}: {}".format(
+                    code, data[4:].decode(encoding="ascii")))
+
+    def _flush_status(self):
+        """Acknowledge the status updates once more than 25 have arrived"""
+        if self._status_update_counter > 25:
+            logger.debug("Acking status updates")
+            self._status_update_counter = 0
+            self.ack_status_update()
 
     def identify(self):
-        self._send_message(Message(MGMSG.MOD_IDENTIFY))
+        self._write_message(_IDENTIFY_MSG)
 
-    def set_channel_enable(self, enable=True, channel=0):
+    @staticmethod
+    def _channel_enable_message(enable=True, channel=0):
         active = 1 if enable else 2
-        self._send_message(
-            Message(MGMSG.MOD_SET_CHANENABLESTATE, param1=channel, param2=active))
+        return Message(MGMSG.MOD_SET_CHANENABLESTATE, param1=channel, param2=active)
 
-    def set_home_params(self, velocity=0, offset=0, channel=0):
+    def set_channel_enable(self, enable=True, channel=0):
+        self._send_message(self._channel_enable_message(enable, channel))
+
+    @staticmethod
+    def _home_params_message(velocity=0, offset=0, channel=0):
         direction = Direction.REVERSE
         limit = LimitSwitch.REVERSE
-        payload = struct.pack("<HHHii", channel, direction, limit, velocity, offset)
-        self._send_message(Message(MGMSG.MOT_SET_HOMEPARAMS, data=payload))
+        payload = _HOME.pack(channel, direction, limit, velocity, offset)
+        return Message(MGMSG.MOT_SET_HOMEPARAMS, data=payload)
+
+    def set_home_params(self, velocity=0, offset=0, channel=0):
+        self._send_message(self._home_params_message(velocity, offset, channel))
+
+    @staticmethod
+    def _velocity_params_message(vel_min=0, vel_max=0, acc=0, channel=0):
+        payload = _VEL.pack(channel, vel_min, acc, vel_max)
+        return Message(MGMSG.MOT_SET_VELPARAMS, data=payload)
 
     def set_velocity_params(self, vel_min=0, vel_max=0, acc=0, channel=0):
-        payload = struct.pack("<Hiii", channel, vel_min, acc, vel_max)
-        self._send_message(Message(MGMSG.MOT_SET_VELPARAMS, data=payload))
+        self._send_message(self._velocity_params_message(vel_min, vel_max, acc,
+                                                         channel))
 
     def get_status(self):
-        msg = self._send_request(MGMSG.MOT_REQ_DCSTATUSUPDATE,
-                                 wait_for=[MGMSG.MOT_GET_DCSTATUSUPDATE])
-        chan, position, velocity, _, status = struct.unpack("=HiHHI", msg.data)
+        msg = self._send_and_wait_one(MGMSG.MOT_REQ_DCSTATUSUPDATE,
+                                      MGMSG.MOT_GET_DCSTATUSUPDATE)
+        chan, position, velocity, _, status = _STATUS.unpack(msg.data)
         return chan, position, velocity, status
 
     def get_status_bits(self):
-        msg = self._send_request(MGMSG.MOT_REQ_STATUSBITS,
-                                 wait_for=[MGMSG.MOT_GET_STATUSBITS])
-        _, status = struct.unpack("=HI", msg.data)
-        return status
+        msg = self._send_and_wait_one(MGMSG.MOT_REQ_STATUSBITS,
+                                      MGMSG.MOT_GET_STATUSBITS)
+        return int.from_bytes(msg.data[2:6], "little")
 
     def suspend_end_of_move_messages(self):
-        self._send_message(Message(MGMSG.MOT_SUSPEND_ENDOFMOVEMSGS))
+        self._write_message(_SUSPEND_END_OF_MOVE_MSG)
 
     def resume_end_of_move_messages(self):
-        self._send_message(Message(MGMSG.MOT_RESUME_ENDOFMOVEMSGS))
+        self._write_message(_RESUME_END_OF_MOVE_MSG)
 
     def ack_status_update(self):
-        self._send_message(Message(MGMSG.MOT_ACK_DCSTATUSUPDATE))
+        self._write_message(_ACK_STATUS_MSG)
+
+    # The motion commands below block until the move has ended, or raise
+    # TimeoutError if `timeout` (in s) is given and it has not ended by then.
 
-    def home(self, channel=0):
+    def _run_motion(self, msg, end_ids, timeout):
+        """Send the packed motion command `msg` and wait for one of `end_ids`
+
+        If an earlier motion command timed out, its end-of-move message is
+        waited for first, so that it is not taken for the end of this one."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            try:
+                if self._pending_end_ids is not None:
+                    self._wait_for_message_until(self._pending_end_ids, deadline)
+                    self._pending_end_ids = None
+                self._write_message(msg)
+                try:
+                    self._wait_for_message_until(end_ids, deadline)
+                except TimeoutError:
+                    self._pending_end_ids = end_ids
+                    raise
+            finally:
+                if deadline is not None:
+                    self.h.timeout = None
+
+    def home(self, channel=0, timeout=None):
         logger.debug("Homing...")
-        self._send_request(MGMSG.MOT_MOVE_HOME,
-                           param1=channel,
-                           wait_for=[MGMSG.MOT_MOVE_HOMED, MGMSG.MOT_MOVE_STOPPED])
+        self._run_motion(
+            Message(MGMSG.MOT_MOVE_HOME, param1=channel).pack(), _HOME_END_IDS, timeout)
         logger.debug("Homed")
 
-    def move(self, position, channel=0):
-        payload = struct.pack("<Hi", channel, position)
-        self._send_request(MGMSG.MOT_MOVE_ABSOLUTE,
-                           data=payload,
-                           wait_for=[MGMSG.MOT_MOVE_COMPLETED])
+    def move(self, position, channel=0, timeout=None):
+        self._run_motion(_build_move(MGMSG.MOT_MOVE_ABSOLUTE, position, channel),
+                         _MOVE_END_IDS, timeout)
+
+    def move_relative(self, position_change, channel=0, timeout=None):
+        self._run_motion(_build_move(MGMSG.MOT_MOVE_RELATIVE, position_change, channel),
+                         _MOVE_END_IDS, timeout)
+
+    def _submit(self, fn, *args, **kwargs):
+        """Run `fn` in the background, returning a `concurrent.futures.Future`
+
+        Calls are run one at a time, in the order they were submitted. Other
+        methods may be called meanwhile from any thread. As each exchange with
+        the device holds `_lock`, they wait for a running move to end, except
+        for `stop()`."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def home_async(self, channel=0, timeout=None):
+        """Start homing, returning a future that resolves once homed
+
+        See `_submit()` for calls made while the future is pending."""
+        return self._submit(self.home, channel, timeout)
 
-    def move_relative(self, position_change, channel=0):
-        payload = struct.pack("<Hi", channel, position_change)
-        self._send_request(MGMSG.MOT_MOVE_RELATIVE,
-                           data=payload,
-                           wait_for=[MGMSG.MOT_MOVE_COMPLETED])
+    def move_async(self, position, channel=0, timeout=None):
+        """Start an absolute move, returning a future that resolves once the
+        move has completed
+
+        See `_submit()` for calls made while the future is pending."""
+        return self._submit(self.move, position, channel, timeout)
+
+    def move_relative_async(self, position_change, channel=0, timeout=None):
+        """Start a relative move, returning a future that resolves once the
+        move has completed
+
+        See `_submit()` for calls made while the future is pending."""
+        return self._submit(self.move_relative, position_change, channel, timeout)
 
     def stop(self):
-        self._send_request(MGMSG.MOT_MOVE_STOP, wait_for=[MGMSG.MOT_MOVE_STOPPED])
+        """Stop the current move, including one running in another thread (e.g.
+        started by `move_async()`), and wait for it to end"""
+        if not self._lock.acquire(blocking=False):
+            # Another exchange, most likely a move, is in progress: send the
+            # command regardless, and let that exchange take the stopped
+            # message. Then wait for it to end.
+            with self._write_lock:
+                self._write(_STOP_MSG)
+            with self._lock:
+                return
+        try:
+            self._write_message(_STOP_MSG)
+            self._wait_for_message((MGMSG.MOT_MOVE_STOPPED, ))
+            # the stopped message ends any move still pending as well
+            self._pending_end_ids = None
+        finally:
+            self._lock.release()
 
     def get_position(self):
         _, position, *_ = self.get_status()
@@ -353,25 +622,18 @@ class _APTDevice:
 
     def is_moving(self):
         status = self.get_status_bits()
-        return (status & Status.MOVING) != 0
+        return (status & _MOVING_MASK) != 0
 
-    def _wait_until_stopped(self, poll_time=0.1):
-        count = 0
-        while True:
-            # sleep at start of loop to allow it to get moving
-            # 40ms appears to be very near the minimum
-            time.sleep(poll_time)
-
-            if not self.is_moving():
-                # require 2 consecutive readings at rest
-                count += 1
-                if count > 1:
-                    break
-            else:
-                count = 0
+    def is_homed(self):
+        """Whether the device has been homed since it was powered up"""
+        return (self.get_status_bits() & Status.HOMED) != 0
 
     def close(self):
-        self.h.close()
+        if self._executor is not None:
+            # let pending moves finish rather than cutting them off mid-reply
+            self._executor.shutdown()
+        with self._lock:
+            self.h.close()
 
     def ping(self):
         try:
@@ -385,21 +647,50 @@ class _APTRotation(_APTDevice):
     """Generic class of rotation mounts"""
 
     def __init__(self, port, auto_home=True):
+        """If `auto_home` is set, the mount is homed unless the controller
+        reports it has already been homed since it was powered up"""
         super().__init__(port)
+        self._last_angle_mu = None
 
         self.setup()
         if auto_home:
-            self.home()
+            if self.is_homed():
+                logger.info("Already homed, skipping homing")
+            else:
+                self.home()
 
     def setup(self):
-        self.set_channel_enable(True)
-        self.set_velocity_params(acc=self.max_acc, vel_max=self.max_vel)
-        self.set_home_params(velocity=self.homing_vel, offset=self.offset)
-
-    def home(self):
-        super().home()
+        self._send_batch(*self._setup_messages())
+
+    def _setup_messages(self):
+        """Configuration messages sent by `setup()`, in order"""
+        return [
+            # Position is always requested explicitly, and moves are waited on
+            # via the end-of-move messages, so periodic status updates would
+            # only have to be read and discarded.
+            Message(MGMSG.HW_STOP_UPDATEMSGS),
+            self._channel_enable_message(True),
+            self._velocity_params_message(acc=self.max_acc, vel_max=self.max_vel),
+            self._home_params_message(velocity=self.homing_vel, offset=self.offset)
+        ]
+
+    def home(self, timeout=None):
+        super().home(timeout=timeout)
         self._last_angle_mu = None
 
+    def home_async(self, timeout=None):
+        """Start homing, returning a future that resolves once homed
+
+        See `_submit()` for calls made while the future is pending."""
+        return self._submit(self.home, timeout)
+
+    def set_angle_async(self, angle, *args, **kwargs):
+        """Start moving to `angle`, returning a future that resolves once there
+
+        Takes the same arguments as `set_angle()`. See `_submit()` for calls
+        made while the future is pending."""
+        return self._submit(self.set_angle, angle, *args, **kwargs)
+
     def set_angle(self, angle, check_position=False, auto_retry=0, acceptable_error=0):
         """
         Set angle in degrees.
@@ -454,18 +745,24 @@ class K10CR1(_APTRotation):
     homing_vel = 7300775
     offset = 546133
 
-    def setup(self):
-        super().setup()
-        self.set_power_params(0.05, 0.3)
+    _full_turn_mu = 360 * steps_per_degree
+    _half_turn_mu = _full_turn_mu // 2
 
-    def set_power_params(self, hold_power=0, move_power=0):
+    def _setup_messages(self):
+        return super()._setup_messages() + [self._power_params_message(0.05, 0.3)]
+
+    @staticmethod
+    def _power_params_message(hold_power=0, move_power=0):
         assert hold_power >= 0 and hold_power <= 1
         assert move_power >= 0 and move_power <= 1
         hold_factor = int(hold_power * 100)
         move_factor = int(move_power * 100)
         channel = 0
-        payload = struct.pack("<HHH", channel, hold_factor, move_factor)
-        self._send_message(Message(MGMSG.MOT_SET_POWER_PARAMS, data=payload))
+        payload = _POWER.pack(channel, hold_factor, move_factor)
+        return Message(MGMSG.MOT_SET_POWER_PARAMS, data=payload)
+
+    def set_power_params(self, hold_power=0, move_power=0):
+        self._send_message(self._power_params_message(hold_power, move_power))
 
     def set_angle(self, angle):
         """Set angle in degrees"""
@@ -474,13 +771,13 @@ class K10CR1(_APTRotation):
         angle = angle % 360
         angle_mu = int(angle * self.steps_per_degree)
 
-        if self._last_angle_mu:
+        if self._last_angle_mu is not None:
             # We know our last position, so we can do a relative move
-            delta = angle_mu - self._last_angle_mu
-            for offset in [360 * self.steps_per_degree, -360 * self.steps_per_degree]:
-                if abs(delta + offset) < abs(delta):
-                    delta += offset
-            self.move_relative(delta)
+            # wrap into [-half turn, half turn) to take the shorter way round
+            delta = ((angle_mu - self._last_angle_mu + self._half_turn_mu) %
+                     self._full_turn_mu) - self._half_turn_mu
+            if delta:
+                self.move_relative(delta)
         else:
             self.move(angle_mu)
         self._last_angle_mu = angle_mu
@@ -489,24 +786,35 @@ class K10CR1(_APTRotation):
 class _KBD101(_APTRotation):
     """This will not work if instantiated directly"""
 
+    # Result of the last req_hw_info(), which does not change for a device
+    _hw_info = None
+
     def setup(self):
         super().setup()
         self.req_hw_info()
 
+    def get_hw_info(self):
+        """Hardware information as returned by `req_hw_info()`
+
+        Only queries the device if it has not been queried before."""
+        if self._hw_info is None:
+            self.req_hw_info()
+        return self._hw_info
+
     def req_hw_info(self):
         """This method must be called to receive move completed messages"""
-        msg = self._send_request(MGMSG.HW_REQ_INFO, wait_for=[MGMSG.HW_GET_INFO])
-        data = struct.unpack("=l8sH4B48s12sHHH", msg.data)
+        msg = self._send_and_wait_one(MGMSG.HW_REQ_INFO, MGMSG.HW_GET_INFO)
+        (serial_no, model_no, type_, fw_minor, fw_interim, fw_major, _, notes,
+         empty_space, hw_version, modstate, nchs) = _HWINFO.unpack_from(msg.data)
 
-        serial_no = data[0]
-        model_no = data[1].rstrip(b'\x00').decode()
-        type_ = data[2]
-        fw_version = '.'.join(map(str, data[3:6]))
-        notes = ', '.join(bs.rstrip(b'\x00').decode() for bs in data[7:9])
-        hw_version, modstate, nchs = data[9:]
+        model_no = model_no.partition(b'\x00')[0].decode()
+        fw_version = f"{fw_minor}.{fw_interim}.{fw_major}"
+        notes = b", ".join(
+            (notes.partition(b'\x00')[0], empty_space.partition(b'\x00')[0])).decode()
 
-        return (serial_no, model_no, type_, fw_version, notes, hw_version, modstate,
-                nchs)
+        self._hw_info = (serial_no, model_no, type_, fw_version, notes, hw_version,
+                         modstate, nchs)
+        return self._hw_info
 
 
 class DDR25(_KBD101):
@@ -527,3 +835,33 @@ class DDR05(_KBD101):
     max_acc = int(10477 * 3.81775)
     homing_vel = int(180 * 37282.5)
     offset = 0
+
+
+def open_devices(cls, ports, **kwargs):
+    """Instantiate `cls` for each of `ports` concurrently
+
+    Connecting, setting up and (auto-)homing each device blocks on the serial
+    line and the mechanics, so overlapping them saves most of the start-up time
+    when bringing up several devices. Keyword arguments are passed on to each
+    constructor. Returns the devices in the order of `ports`.
+
+    If any device fails to open, those that did are closed again before the
+    first error is re-raised."""
+    ports = list(ports)
+    if not ports:
+        return []
+    with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+        futures = [executor.submit(cls, port, **kwargs) for port in ports]
+    errors = [f.exception() for f in futures if f.exception() is not None]
+    if errors:
+        for future in futures:
+            if future.exception() is None:
+                future.result().close()
+        raise errors[0]
+    return [future.result() for future in futures]
+
+
+def home_devices(devices):
+    """Home all of `devices` at once, returning when all are homed"""
+    for future in [device.home_async() for device in devices]:
+        future.result()
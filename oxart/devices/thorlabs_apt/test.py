@@ -3,20 +3,18 @@ from driver import *
 
 
 def print_status(h):
-    h._send_message(MsgMotReqDcStatus())
-    msg = h._wait_for_message(ID_MSG_DCSTATUSUPDATE)
-    chan, position, velocity, _, status = struct.unpack("=HIHHI", msg.data)
+    chan, position, velocity, status = h.get_status()
     print(chan, position, velocity, status)
     status_str = ""
-    if status & 0x80000000:
+    if status & Status.ENABLED:
         status_str += "ENABLED, "
-    if status & 0x200:
+    if status & Status.MOVING_HOME:
         status_str += "MOVE_HOME, "
-    if status & 0x400:
+    if status & Status.HOMED:
         status_str += "HOMED, "
-    if status & 0x10:
+    if status & Status.MOVING_FORWARD:
         status_str += "MOVE_FORWARD, "
-    if status & 0x20:
+    if status & Status.MOVING_REVERSE:
         status_str += "MOVE_BACK, "
     print(status_str)
 
@@ -28,8 +26,8 @@ if __name__ == "__main__":
     # acceleration = int(stage.acc_scale*stage.max_acc - 1)
     # h.set_home_params(velocity=int(stage.vel_scale*180))
     # h.set_velocity_params(vel_max=velocity, acc=acceleration)
-    # h._send_message(MsgMotAckDcStatusUpdate())
-    # h._send_message(MsgMotResumeEndOfMoveMsgs())
+    # h.ack_status_update()
+    # h.resume_end_of_move_messages()
 
     h.home()
     print_status(h)
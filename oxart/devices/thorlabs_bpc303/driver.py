@@ -1,4 +1,6 @@
 from oxart.devices.thorlabs_apt.driver import MGMSG, SRC_DEST, Message, MsgError
+from oxart.devices.streams import ReadBuffer, enable_low_latency
+from oxart.devices.debounce import DebouncedSave
 import struct
 import sipyco.pyon as pyon
 import serial
@@ -18,12 +20,46 @@ NUM_SLOTS_MAX = 10
 PZ_TRAVEL_UM = 20.0
 PZ_MAX_VOLTAGE = 75.0
 
+# Conversions between volts/um and the full-scale 15 bit device units
+_VOLT_SCALE = 32767 / PZ_MAX_VOLTAGE
+_VOLT_INV = PZ_MAX_VOLTAGE / 32767
+_POS_SCALE = 32767 / PZ_TRAVEL_UM
+_POS_INV = PZ_TRAVEL_UM / 32767
+
+# Keys of the per-bay setpoints in the save file, indexed by bay_idx
+_VOLT_KEYS = tuple("volt_{}".format(i) for i in range(NUM_SLOTS_MAX))
+_POS_KEYS = tuple("pos_{}".format(i) for i in range(NUM_SLOTS_MAX))
+
+# Set commands are saved to file this long (in s) after the first unsaved one
+_SAVE_DELAY = 0.25
+
+# Every request is answered right away, so a reply taking longer than this (in s)
+# has been lost
+_READ_TIMEOUT = 0.5
+
+# Precompiled layouts of the message headers and payloads used below
+_HWINFO = struct.Struct("<L8sH4s60sHHH")
+_OUTPUT_VOLTS = struct.Struct("<Hh")
+_OUTPUT_POS = struct.Struct("<HH")
+_OUTPUT_MAX_VOLTS = struct.Struct("<HHH")
+_PI_CONSTS = struct.Struct("<HHH")
+
 
 class _APTCardSlotDevice:
 
     def __init__(self, port):
-        self.h = serial.Serial(port, 115200, write_timeout=0.1)
+        self.h = serial.Serial(port, 115200, timeout=_READ_TIMEOUT, write_timeout=0.1)
+        enable_low_latency(self.h)
         self._status_update_counter = 0
+        self._serial = None
+        self._rx = ReadBuffer(self.h)
+        # Handlers for incoming messages needing action, by message id
+        self._triage = {
+            MGMSG.HW_DISCONNECT: self._on_disconnect,
+            MGMSG.HW_RESPONSE: self._on_hw_response,
+            MGMSG.HW_RICHRESPONSE: self._on_hw_rich_response,
+            MGMSG.PZ_GET_PZSTATUSUPDATE: self._on_status_update
+        }
 
         # Detect occupied bays
         self.bays = []
@@ -39,19 +75,25 @@ class _APTCardSlotDevice:
 
     def _send_message(self, message):
         msg = message.pack()
-        logger.debug("Sending: {}".format(message))
-        logger.debug("tx: {}".format(msg.hex()))
+        logger.debug("Sending: %s", message)
+        logger.debug("tx: %s", msg.hex())
         self.h.write(msg)
 
     def _read_message(self):
-        header = self.h.read(6)
-        data = b""
-        if header[4] & 0x80:
-            (length, ) = struct.unpack("<H", header[2:4])
-            data = self.h.read(length)
-        msg = Message.unpack(header + data)
-        logger.debug("rx: {}{}".format(header.hex(), data.hex()))
-        logger.debug("Received: {}".format(msg))
+        """Read the next message, raising TimeoutError if none arrives within the
+        read timeout"""
+        rx = self._rx
+        rx.ensure(6)
+        rxbuf, pos = rx.data, rx.pos
+        size = 6
+        if rxbuf[pos + 4] & 0x80:
+            size += int.from_bytes(rxbuf[pos + 2:pos + 4], "little")
+            rx.ensure(size)
+        msg = Message.unpack_from(rxbuf, pos)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("rx: %s", rxbuf[pos:pos + size].hex())
+            logger.debug("Received: %s", msg)
+        rx.consume(size)
         return msg
 
     def _send_request(self,
@@ -62,6 +104,9 @@ class _APTCardSlotDevice:
                       dest=SRC_DEST["RACK_CONTROLLER"].value,
                       data=None):
         self._send_message(Message(msgreq_id, param1, param2, dest, data=data))
+        return self._wait_for_message(wait_for)
+
+    def _wait_for_message(self, wait_for):
         while True:
             msg = self._read_message()
             self._triage_message(msg)
@@ -71,23 +116,28 @@ class _APTCardSlotDevice:
 
     def _triage_message(self, msg):
         """Triage an incoming message in case of errors or action required"""
-        msg_id = msg._id
+        handler = self._triage.get(msg._id)
+        if handler is not None:
+            handler(msg)
+
+    def _on_disconnect(self, msg):
+        raise MsgError("Error: Please disconnect")
+
+    def _on_hw_response(self, msg):
+        raise MsgError("Hardware error, please disconnect")
+
+    def _on_hw_rich_response(self, msg):
         data = msg.data
+        code = int.from_bytes(data[2:4], "little")
+        raise MsgError("Hardware error {}: {}".format(
+            code, data[4:].decode(encoding="ascii")))
 
-        if msg_id == MGMSG.HW_DISCONNECT:
-            raise MsgError("Error: Please disconnect")
-        elif msg_id == MGMSG.HW_RESPONSE:
-            raise MsgError("Hardware error, please disconnect")
-        elif msg_id == MGMSG.HW_RICHRESPONSE:
-            (code, ) = struct.unpack("<H", data[2:4])
-            raise MsgError("Hardware error {}: {}".format(
-                code, data[4:].decode(encoding="ascii")))
-        elif msg_id == MGMSG.PZ_GET_PZSTATUSUPDATE:
-            self._status_update_counter += 1
-            if self._status_update_counter > 25:
-                logger.debug("Acking status updates")
-                self._status_update_counter = 0
-                self.ack_status_update()
+    def _on_status_update(self, msg):
+        self._status_update_counter += 1
+        if self._status_update_counter > 25:
+            logger.debug("Acking status updates")
+            self._status_update_counter = 0
+            self.ack_status_update()
 
     def identify(self, bay_id):
         """ Corresponding screen will start blinking on frontpanel """
@@ -117,8 +167,7 @@ class _APTCardSlotDevice:
         msg = self._send_request(MGMSG.PZ_REQ_PZSTATUSBITS,
                                  wait_for=[MGMSG.PZ_GET_PZSTATUSBITS],
                                  dest=self.bays[bay_id - 1])
-        chan, status = struct.unpack("=HI", msg.data)
-        return status
+        return int.from_bytes(msg.data[2:6], "little")
 
     def ack_status_update(self):
         self._send_message(
@@ -126,21 +175,51 @@ class _APTCardSlotDevice:
                     dest=SRC_DEST["RACK_CONTROLLER"].value))
 
     def get_serial(self):
+        """Serial number of the rack, only queried from the device once"""
+        if self._serial is not None:
+            return self._serial
         msg = self._send_request(MGMSG.HW_REQ_INFO,
                                  wait_for=[MGMSG.HW_GET_INFO],
                                  dest=SRC_DEST["RACK_CONTROLLER"].value)
         serial, model, hw_type, firmware, _, hw_version, mod, num_channels = \
-            struct.unpack("=L8sH4s60sHHH", msg.data)
+            _HWINFO.unpack(msg.data)
+        self._serial = serial
         return serial
 
     def ping(self):
+        outstanding = 0
         try:
-            for i, _ in enumerate(self.bays):
-                self.get_status_bits(i + 1)
+            # Query all bays before reading any reply, so that the round-trips
+            # overlap instead of adding up
+            for bay in self.bays:
+                self._send_message(Message(MGMSG.PZ_REQ_PZSTATUSBITS, dest=bay))
+                outstanding += 1
+            while outstanding:
+                self._wait_for_message([MGMSG.PZ_GET_PZSTATUSBITS])
+                outstanding -= 1
         except Exception:
             return False
+        finally:
+            if outstanding:
+                self._discard_replies(outstanding)
         return True
 
+    def _discard_replies(self, count):
+        """Read and drop up to `count` outstanding status replies
+
+        Stops at the first read timeout, after which anything left over is
+        flushed, so that later requests are not answered by stale replies."""
+        while count:
+            try:
+                self._wait_for_message([MGMSG.PZ_GET_PZSTATUSBITS])
+            except MsgError:
+                continue
+            except Exception:
+                self._rx.clear()
+                self.h.reset_input_buffer()
+                return
+            count -= 1
+
     def close(self):
         """Close the serial port."""
         self.h.close()
@@ -160,9 +239,8 @@ class BPC303(_APTCardSlotDevice):
         logger.info("Device vlimit is {}, travel is {}um".format(
             PZ_MAX_VOLTAGE, PZ_TRAVEL_UM))
         self.fname = "piezo_{}.pyon".format(self.get_serial())
-        self.voltages = {"volt_{}".format(i): -1 for i in range(len(self.bays))}
-        self.positions = {"pos_{}".format(i): -1 for i in range(len(self.bays))}
         self.enable_feedback = enable_feedback
+        self._saver = DebouncedSave(self._save_setpoints, _SAVE_DELAY)
         self._load_setpoints()
         self.setup()
 
@@ -190,9 +268,9 @@ class BPC303(_APTCardSlotDevice):
         self._check_valid_channel(channel_char)
         bay_idx = ord(channel_char) - ord('x')
         if self.enable_feedback:
-            return self.positions["pos_{}".format(bay_idx)]
+            return self.positions[_POS_KEYS[bay_idx]]
         else:
-            return self.voltages["volt_{}".format(bay_idx)]
+            return self.voltages[_VOLT_KEYS[bay_idx]]
 
     def get_channel_output(self, channel_char):
         """ Get actual output value (query hardware) """
@@ -213,19 +291,19 @@ class BPC303(_APTCardSlotDevice):
         """
         voltage = float(voltage)
         self._check_voltage_in_limit(voltage)
-        payload = struct.pack("<Hh", channel, int(voltage * 32767 / PZ_MAX_VOLTAGE))
+        payload = _OUTPUT_VOLTS.pack(channel, int(voltage * _VOLT_SCALE))
         self._send_message(
             Message(MGMSG.PZ_SET_OUTPUTVOLTS, dest=self.bays[bay_id - 1], data=payload))
-        self.voltages["volt_{}".format(bay_id - 1)] = voltage
-        self._save_setpoints()
+        self.voltages[_VOLT_KEYS[bay_id - 1]] = voltage
+        self._saver.request()
 
     def get_voltage(self, bay_id, channel=0):
         msg = self._send_request(MGMSG.PZ_REQ_OUTPUTVOLTS,
                                  wait_for=[MGMSG.PZ_GET_OUTPUTVOLTS],
                                  dest=self.bays[bay_id - 1],
                                  param1=channel)
-        chan, v = struct.unpack("=Hh", msg.data)
-        return v / 32767 * PZ_MAX_VOLTAGE
+        chan, v = _OUTPUT_VOLTS.unpack(msg.data)
+        return v * _VOLT_INV
 
     def set_position(self, bay_id, position, channel=0):
         """
@@ -234,19 +312,42 @@ class BPC303(_APTCardSlotDevice):
         """
         position = float(position)
         self._check_position_in_limit(position)
-        payload = struct.pack("<HH", channel, int(position * 32767.0 / PZ_TRAVEL_UM))
+        payload = _OUTPUT_POS.pack(channel, int(position * _POS_SCALE))
         self._send_message(
             Message(MGMSG.PZ_SET_OUTPUTPOS, dest=self.bays[bay_id - 1], data=payload))
-        self.positions["pos_{}".format(bay_id - 1)] = position
-        self._save_setpoints()
+        self.positions[_POS_KEYS[bay_id - 1]] = position
+        self._saver.request()
+
+    def set_positions(self, positions, channel=0):
+        """
+        Set the piezos of bays 1, 2, ... to the given positions in one go.
+        All positions are checked before any is sent. In open-loop mode, this
+        is ignored.
+        """
+        positions = [float(position) for position in positions]
+        if len(positions) > len(self.bays):
+            raise ValueError("{} positions given for {} bays".format(
+                len(positions), len(self.bays)))
+        for position in positions:
+            self._check_position_in_limit(position)
+        # The commands need no reply, so send them back-to-back in a single write
+        packed = []
+        for bay_idx, position in enumerate(positions):
+            payload = _OUTPUT_POS.pack(channel, int(position * _POS_SCALE))
+            msg = Message(MGMSG.PZ_SET_OUTPUTPOS, dest=self.bays[bay_idx], data=payload)
+            logger.debug("Sending: %s", msg)
+            packed.append(msg.pack())
+            self.positions[_POS_KEYS[bay_idx]] = position
+        self.h.write(b"".join(packed))
+        self._saver.request()
 
     def get_position(self, bay_id, channel=0):
         msg = self._send_request(MGMSG.PZ_REQ_OUTPUTPOS,
                                  wait_for=[MGMSG.PZ_GET_OUTPUTPOS],
                                  dest=self.bays[bay_id - 1],
                                  param1=channel)
-        chan, pos = struct.unpack("=HH", msg.data)
-        return pos / 32767.0 * PZ_TRAVEL_UM
+        chan, pos = _OUTPUT_POS.unpack(msg.data)
+        return pos * _POS_INV
 
     def feedback_enabled(self):
         return self.enable_feedback
@@ -281,7 +382,7 @@ class BPC303(_APTCardSlotDevice):
     def set_voltage_limit(self, bay_id, voltage, channel=0):
         if voltage > 150 or voltage < 0:
             raise ValueError("{}V not between 0V and 150V".format(voltage))
-        payload = struct.pack("<HHH", channel, int(10 * voltage), 0)
+        payload = _OUTPUT_MAX_VOLTS.pack(channel, int(10 * voltage), 0)
         self._send_message(
             Message(MGMSG.PZ_SET_OUTPUTMAXVOLTS,
                     dest=self.bays[bay_id - 1],
@@ -291,7 +392,7 @@ class BPC303(_APTCardSlotDevice):
         msg = self._send_request(MGMSG.PZ_REQ_OUTPUTMAXVOLTS,
                                  wait_for=[MGMSG.PZ_GET_OUTPUTMAXVOLTS],
                                  dest=self.bays[bay_id - 1])
-        chan, voltage_limit, flags = struct.unpack("=HHH", msg.data)
+        chan, voltage_limit, flags = _OUTPUT_MAX_VOLTS.unpack(msg.data)
         return voltage_limit / 10.0
 
     def get_pi_constants(self, bay_id, channel=0):
@@ -299,11 +400,11 @@ class BPC303(_APTCardSlotDevice):
                                  wait_for=[MGMSG.PZ_GET_PICONSTS],
                                  param1=channel,
                                  dest=self.bays[bay_id - 1])
-        chan, prop_gain, int_gain = struct.unpack("=HHH", msg.data)
+        chan, prop_gain, int_gain = _PI_CONSTS.unpack(msg.data)
         return prop_gain, int_gain
 
     def set_pi_constants(self, bay_id, prop_gain, int_gain, channel=0):
-        payload = struct.pack("<HHH", channel, prop_gain, int_gain)
+        payload = _PI_CONSTS.pack(channel, prop_gain, int_gain)
         self._send_message(
             Message(MGMSG.PZ_SET_PICONSTS, dest=self.bays[bay_id - 1], data=payload))
 
@@ -333,20 +434,31 @@ class BPC303(_APTCardSlotDevice):
     # Save file operations
     #
     def _load_setpoints(self):
-        """Load setpoints from a file"""
+        """Load setpoints from a file, or mark them all as unknown (-1)"""
         try:
             self.voltages, self.positions = pyon.load_file(self.fname)
             logger.info("Loaded '{}', voltages: {}, positions: {}".format(
                 self.fname, self.voltages, self.positions))
         except FileNotFoundError:
             logger.warning("Couldn't find '{}', no setpoints loaded".format(self.fname))
+            num_bays = len(self.bays)
+            self.voltages = dict.fromkeys(_VOLT_KEYS[:num_bays], -1)
+            self.positions = dict.fromkeys(_POS_KEYS[:num_bays], -1)
 
     def _save_setpoints(self):
-        """Write the setpoints out to file"""
-        pyon.store_file(self.fname, [self.voltages, self.positions])
+        """Write the setpoints out to file (called by `_saver` only)"""
+        voltages, positions = dict(self.voltages), dict(self.positions)
+        pyon.store_file(self.fname, [voltages, positions])
         logger.debug("Saved '{}', voltages: {}, positions: {}".format(
-            self.fname, self.voltages, self.positions))
+            self.fname, voltages, positions))
 
     def save_setpoints(self):
-        """Deprecated: setpoints are saved internally on every set command"""
-        self._save_setpoints()
+        """Write the setpoints out to file now
+
+        Setpoints are saved automatically shortly after every set command."""
+        self._saver.save_now()
+
+    def close(self):
+        """Save any pending setpoints and close the serial port."""
+        self._saver.flush()
+        super().close()
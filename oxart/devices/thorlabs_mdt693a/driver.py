@@ -4,6 +4,10 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# A reply is either enclosed in brackets, or a number following a '*' at the end
+# of the line
+_REPLY_RE = re.compile(r'\[(.*)\]|\*([0-9\.]+\Z)')
+
 
 class PiezoController:
     """Driver for Thorlabs MDT693A 3-channel open-loop piezo controller.
@@ -35,18 +39,13 @@ class PiezoController:
     def _read_line(self):
         """Send a command, and return the output of the command as a string"""
         s = self.dev.readline().decode()
-        a1 = re.search(r'\[(.*)\]', s)
-        a2 = re.search(r'\*([0-9\.]+\Z)', s)
-        while a1 is None and a2 is None and s != '':
+        match = _REPLY_RE.search(s)
+        while match is None and s != '':
             s = self.dev.readline().decode()
-            a1 = re.search(r'\[(.*)\]', s)
-            a2 = re.search(r'\*([0-9\.]+\Z)', s)
-        if a1 is not None:
-            return a1.group(1)
-        elif a2 is not None:
-            return a2.group(1)
-        else:
+            match = _REPLY_RE.search(s)
+        if match is None:
             raise Exception('No information returned from command')
+        return match.group(match.lastindex)
 
     def read_voltage(self, ch):
         msg = ch + "R?"
@@ -55,6 +54,17 @@ class PiezoController:
         voltage = reply
         return voltage
 
+    @staticmethod
+    def _voltage_cmd(ch, voltage):
+        return "{}V{:.3f}".format(ch, voltage)
+
     def set_voltage(self, ch, voltage):
-        msg = "%sV" % (ch) + "{:.3f}".format(voltage)
-        self._send_cmd(msg)
+        self._send_cmd(self._voltage_cmd(ch, voltage))
+
+    def set_voltages(self, voltages):
+        """Set several channels at once, e.g. {'x': 10.0, 'y': 20.0}
+
+        The commands need no reply, so all of them are sent in a single write."""
+        cmd = "".join(
+            self._voltage_cmd(ch, voltage) + "\r" for ch, voltage in voltages.items())
+        self.dev.write(cmd.encode())
@@ -8,8 +8,14 @@ import appdirs
 
 import sipyco.pyon as pyon
 
+from oxart.devices.debounce import DebouncedSave
+from oxart.devices.streams import enable_low_latency
+
 logger = logging.getLogger(__name__)
 
+# Set commands are saved to file this long (in s) after the first unsaved one
+_SAVE_DELAY = 0.25
+
 
 def _get_data_dir():
     """Get the name of the data directory and create it if necessary"""
@@ -29,8 +35,10 @@ class PiezoController:
                                           baudrate=115200,
                                           timeout=0.1,
                                           write_timeout=0.1)
+        enable_low_latency(self.port)
 
         self.echo = None
+        self._id = None
         self._purge()
 
         firmware = self.get_firmware_version()
@@ -53,10 +61,12 @@ class PiezoController:
         self.filename = "piezo_{}.pyon".format(self.get_serial())
         self.abs_filename = os.path.join(self.data_dir, self.filename)
         self.channels = {'x': -1, 'y': -1, 'z': -1}
+        self._saver = DebouncedSave(self._save_setpoints, _SAVE_DELAY)
         self._load_setpoints()
 
     def close(self):
-        """Close the serial port."""
+        """Save any pending setpoints and close the serial port."""
+        self._saver.flush()
         self.port.close()
 
     def feedback_enabled(self):
@@ -85,14 +95,8 @@ class PiezoController:
             _ = self._read_line()
 
     def _read_line(self):
-        """Read a CR terminated line. Returns '' on timeout"""
-        line = ''
-        while len(line) == 0 or line[-1] != '\r':
-            c = self.port.read().decode()
-            if c == '':
-                # Timeout occurred
-                break
-            line += c
+        """Read a CR terminated line. Returns what was read so far on timeout"""
+        line = self.port.read_until(b'\r').decode()
         logger.debug("Read " + repr(line))
         return line
 
@@ -102,10 +106,12 @@ class PiezoController:
         self._reset_input_timeout()
 
     def _reset_input_timeout(self):
-        """Read everything off the input and discard"""
-        _ = self.port.read().decode()
-        while _ != '':
-            _ = self.port.read().decode()
+        """Read everything off the input and discard
+
+        Waits for the input to be silent for a timeout, so that a reply still
+        on its way is discarded too."""
+        while self.port.read(max(1, self.port.in_waiting)):
+            pass
 
     def _reset_input(self):
         """Reset the input. Firmware version specific."""
@@ -127,11 +133,18 @@ class PiezoController:
         """Has to wait for timeout"""
         cmd_str = '{}?'.format(cmd)
         self._send_command(cmd_str)
-        para = ''
-        line = self._read_line()
-        while line != '':
-            para += line
-            line = self._read_line()
+        # Everything waiting is read at once, until the line is silent
+        para = b''
+        chunk = self.port.read(max(1, self.port.in_waiting))
+        while chunk:
+            para += chunk
+            chunk = self.port.read(max(1, self.port.in_waiting))
+        para = para.decode()
+        logger.debug("Read " + repr(para))
+        # Before the echo mode is known, the command may have been echoed back
+        echo = cmd_str + '\r'
+        if para.startswith(echo):
+            para = para[len(echo):]
         return para.replace('\r', '\n')
 
     #
@@ -196,26 +209,16 @@ class PiezoController:
         return response
 
     def _check_1_09(self):
-        c = self.port.read().decode()
-        if c == '>':
+        s = self.port.read_until(b'>')
+        if s == b'>':
             return None
+        elif s == b'CMD_NOT_DEFINED>':
+            raise CommandNotDefined()
         else:
-            s = c
-            while s[-1] != '>':
-                c = self.port.read().decode()
-                if c == '':
-                    # Timeout occurred
-                    break
-                s += c
-            if s == 'CMD_NOT_DEFINED>':
-                raise CommandNotDefined()
-            else:
-                raise ParseError()
+            raise ParseError()
 
     def _reset_input_1_09(self):
-        _ = self.port.read().decode()
-        while _ != '>' and _ != '':
-            _ = self.port.read().decode()
+        self.port.read_until(b'>')
 
     #
     # Get/Set commands
@@ -246,12 +249,15 @@ class PiezoController:
         """Returns the identity paragraph.
 
         This includes the device model, serial number, and firmware version.
-        This function needs to wait for a serial timeout, hence is a little
-        slow"""
+        The first call needs to wait for a serial timeout, hence is a little
+        slow; the paragraph never changes, so later calls return it from
+        memory."""
         # Due to the crappy Thorlabs protocol (no clear finish marker) we have
         # to wait for a timeout to ensure that we have read everything
         # (only for true for versions <1.09)
-        return self._get_multiline('id')
+        if self._id is None:
+            self._id = self._get_multiline('id')
+        return self._id
 
     def get_firmware_version(self):
         id_ = self.get_id()
@@ -279,7 +285,7 @@ class PiezoController:
         cmd = channel + 'voltage'
         self._set(cmd, voltage)
         self.channels[channel] = voltage
-        self._save_setpoints()
+        self._saver.request()
 
     def get_channel_output(self, channel):
         """Returns the current *output* voltage for a given channel.
@@ -338,13 +344,17 @@ class PiezoController:
                 self.filename, self.data_dir))
 
     def _save_setpoints(self):
-        """Write the setpoints out to file"""
-        pyon.store_file(self.abs_filename, self.channels)
-        logger.debug("Saved '{}', channels: {}".format(self.filename, self.channels))
+        """Write the setpoints out to file (called by `_saver` only)"""
+        channels = dict(self.channels)
+        pyon.store_file(self.abs_filename, channels)
+        logger.debug("Saved '{}', channels: {}".format(self.filename, channels))
 
     def save_setpoints(self):
-        """Deprecated: setpoints are saved internally on every set command"""
-        self._save_setpoints()
+        """Write the setpoints out to file now
+
+        Deprecated: setpoints are saved automatically shortly after every set
+        command."""
+        self._saver.save_now()
 
     #
     # ping() required - get_voltage_limit() should raise an error if something
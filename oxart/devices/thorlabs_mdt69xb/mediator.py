@@ -1,4 +1,4 @@
-import numpy as np
+import math
 import time
 
 
@@ -37,10 +37,12 @@ class PiezoWrapper:
                            "Calibrate with laser unlocked before reuse.")
                 raise NoSetpointError(err_msg)
             else:
-                sgn = np.sign(value - current)
-                while abs(value - current) > step:
-                    current += sgn * step
-                    device.set_channel(channel, current)
+                # Intermediate steps, each `step` further from `current`; the
+                # last one, which may be shorter, is the final set below
+                n_steps = math.ceil(abs(value - current) / step)
+                step = math.copysign(step, value - current)
+                for i in range(1, n_steps):
+                    device.set_channel(channel, current + i * step)
                     time.sleep(0.01)
         device.set_channel(channel, value)
 
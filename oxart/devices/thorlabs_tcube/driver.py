@@ -7,6 +7,19 @@ import asyncserial
 
 logger = logging.getLogger(__name__)
 
+# Precompiled layouts of the message headers and of the payloads sent or
+# received most often
+_MSG_HDR = st.Struct("<HBBBB")
+_MSG_DATA_HDR = st.Struct("<HHBB")
+_LEN = st.Struct("<H")
+# channel followed by a single 16 bit (output voltage/position) or signed 32
+# bit (move distance/position) value
+_CHAN_U16 = st.Struct("<HH")
+_CHAN_I32 = st.Struct("<Hl")
+_VEL_PARAMS = st.Struct("<HLLL")
+_HOME_PARAMS = st.Struct("<HHHLL")
+_DC_STATUS = st.Struct("<LHHL")
+
 
 class MGMSG(Enum):
     HW_DISCONNECT = 0x0002
@@ -111,6 +124,15 @@ class MGMSG(Enum):
     PZ_GET_TPZ_IOSETTINGS = 0x07D6
 
 
+# Messages ending a (non-homing) move, and a home move, respectively
+_MOVE_END_IDS = frozenset({MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED})
+_HOME_END_IDS = frozenset({MGMSG.MOT_MOVE_HOMED, MGMSG.MOT_MOVE_STOPPED})
+
+# Messages carrying a DC servo status update
+_DC_STATUS_IDS = frozenset(
+    {MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED, MGMSG.MOT_GET_DCSTATUSUPDATE})
+
+
 class Direction:
 
     def __init__(self, direction):
@@ -148,7 +170,7 @@ class Message:
 
     @staticmethod
     def unpack(data):
-        id, param1, param2, dest, src = st.unpack("<HBBBB", data[:6])
+        id, param1, param2, dest, src = _MSG_HDR.unpack_from(data)
         data = data[6:]
         if dest & 0x80:
             if data and len(data) != param1 | (param2 << 8):
@@ -160,11 +182,11 @@ class Message:
 
     def pack(self):
         if self.has_data:
-            return st.pack("<HHBB", self.id.value, len(self.data), self.dest | 0x80,
-                           self.src) + self.data
+            return _MSG_DATA_HDR.pack(self.id.value, len(self.data), self.dest | 0x80,
+                                      self.src) + self.data
         else:
-            return st.pack("<HBBBB", self.id.value, self.param1, self.param2, self.dest,
-                           self.src)
+            return _MSG_HDR.pack(self.id.value, self.param1, self.param2, self.dest,
+                                 self.src)
 
     @property
     def has_data(self):
@@ -196,7 +218,7 @@ class _Tcube:
         logger.debug("received header: %s", header)
         data = b""
         if header[4] & 0x80:
-            (length, ) = st.unpack("<H", header[2:4])
+            (length, ) = _LEN.unpack_from(header, 2)
             data = await self.port.read_exactly(length)
         r = Message.unpack(header + data)
         logger.debug("receiving: %s", r)
@@ -345,7 +367,7 @@ class Tpz(_Tcube):
             raise ValueError("Voltage must be in range [0;{}]".format(
                 self.voltage_limit))
         volt = int(voltage * 32767 / self.voltage_limit)
-        payload = st.pack("<HH", 1, volt)
+        payload = _CHAN_U16.pack(1, volt)
         await self.send(Message(MGMSG.PZ_SET_OUTPUTVOLTS, data=payload))
 
     async def get_output_volts(self):
@@ -367,7 +389,7 @@ class Tpz(_Tcube):
             [0; 65535] depending on the unit. This corresponds to 0 to 100% of
             the maximum piezo extension.
         """
-        payload = st.pack("<HH", 1, position_sw)
+        payload = _CHAN_U16.pack(1, position_sw)
         await self.send(Message(MGMSG.PZ_SET_OUTPUTPOS, data=payload))
 
     async def get_output_position(self):
@@ -670,15 +692,15 @@ class Tdc(_Tcube):
             (code, ) = st.unpack("<H", data[2:4])
             raise MsgError("Hardware error {}: {}".format(
                 code, data[4:].decode(encoding="ascii")))
-        elif (msg_id == MGMSG.MOT_MOVE_COMPLETED or msg_id == MGMSG.MOT_MOVE_STOPPED
-              or msg_id == MGMSG.MOT_GET_DCSTATUSUPDATE):
+        elif msg_id in _DC_STATUS_IDS:
             if self.status_report_counter == 25:
                 self.status_report_counter = 0
                 await self.send(Message(MGMSG.MOT_ACK_DCSTATUSUPDATE))
             else:
                 self.status_report_counter += 1
             # 'r' is a currently unused and reserved field
-            self.position, self.velocity, r, self.status = st.unpack("<LHHL", data[2:])
+            self.position, self.velocity, r, self.status = _DC_STATUS.unpack_from(
+                data, 2)
 
     async def is_moving(self):
         status_bits = await self.get_status_bits()
@@ -729,7 +751,7 @@ class Tdc(_Tcube):
         actual position.
         :param position: The new value of the position counter.
         """
-        payload = st.pack("<Hl", 1, position)
+        payload = _CHAN_I32.pack(1, position)
         await self.send(Message(MGMSG.MOT_SET_POSCOUNTER, data=payload))
 
     async def get_position_counter(self):
@@ -748,7 +770,7 @@ class Tdc(_Tcube):
         Instead the device is homed at power-up.
         :param encoder_count: The new value of the encoder counter.
         """
-        payload = st.pack("<Hl", 1, encoder_count)
+        payload = _CHAN_I32.pack(1, encoder_count)
         await self.send(Message(MGMSG.MOT_SET_ENCCOUNTER, data=payload))
 
     async def get_encoder_counter(self):
@@ -765,7 +787,7 @@ class Tdc(_Tcube):
         :param acceleration: The acceleration in encoder counts/sec/sec.
         :param max_velocity: The maximum (final) velocity in counts/sec.
         """
-        payload = st.pack("<HLLL", 1, 0, acceleration, max_velocity)
+        payload = _VEL_PARAMS.pack(1, 0, acceleration, max_velocity)
         await self.send(Message(MGMSG.MOT_SET_VELPARAMS, data=payload))
 
     async def get_velocity_parameters(self):
@@ -809,7 +831,7 @@ class Tdc(_Tcube):
         :param backlash_distance: The value of the backlash distance,
             which specifies the relative distance in position counts.
         """
-        payload = st.pack("<Hl", 1, backlash_distance)
+        payload = _CHAN_I32.pack(1, backlash_distance)
         await self.send(Message(MGMSG.MOT_SET_GENMOVEPARAMS, data=payload))
 
     async def get_gen_move_parameters(self):
@@ -827,7 +849,7 @@ class Tdc(_Tcube):
             integer that specifies the relative distance in position encoder
             counts.
         """
-        payload = st.pack("<Hl", 1, relative_distance)
+        payload = _CHAN_I32.pack(1, relative_distance)
         await self.send(Message(MGMSG.MOT_SET_MOVERELPARAMS, data=payload))
 
     async def get_move_relative_parameters(self):
@@ -845,7 +867,7 @@ class Tdc(_Tcube):
             signed integer that specifies the absolute move position in encoder
             counts.
         """
-        payload = st.pack("<Hl", 1, absolute_position)
+        payload = _CHAN_I32.pack(1, absolute_position)
         await self.send(Message(MGMSG.MOT_SET_MOVEABSPARAMS, data=payload))
 
     async def get_move_absolute_parameters(self):
@@ -861,7 +883,7 @@ class Tdc(_Tcube):
         """Set the homing velocity parameter.
         :param home_velocity: Homing velocity.
         """
-        payload = st.pack("<HHHLL", 1, 0, 0, home_velocity, 0)
+        payload = _HOME_PARAMS.pack(1, 0, 0, home_velocity, 0)
         await self.send(Message(MGMSG.MOT_SET_HOMEPARAMS, data=payload))
 
     async def get_home_parameters(self):
@@ -877,8 +899,7 @@ class Tdc(_Tcube):
         """Start a home move sequence.
         This call is blocking until device is homed or move is stopped.
         """
-        await self.send_request(MGMSG.MOT_MOVE_HOME,
-                                [MGMSG.MOT_MOVE_HOMED, MGMSG.MOT_MOVE_STOPPED], 1)
+        await self.send_request(MGMSG.MOT_MOVE_HOME, _HOME_END_IDS, 1)
 
     async def set_limit_switch_parameters(self, cw_hw_limit, ccw_hw_limit):
         """Set the limit switch parameters.
@@ -922,18 +943,15 @@ class Tdc(_Tcube):
         <Tdc.set_move_relative_parameters>`
         command.
         """
-        await self.send_request(MGMSG.MOT_MOVE_RELATIVE,
-                                [MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED], 1)
+        await self.send_request(MGMSG.MOT_MOVE_RELATIVE, _MOVE_END_IDS, 1)
 
     async def move_relative(self, relative_distance):
         """Start a relative move
         :param relative_distance: The distance to move in position encoder
             counts.
         """
-        payload = st.pack("<Hl", 1, relative_distance)
-        await self.send_request(MGMSG.MOT_MOVE_RELATIVE,
-                                [MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED],
-                                data=payload)
+        payload = _CHAN_I32.pack(1, relative_distance)
+        await self.send_request(MGMSG.MOT_MOVE_RELATIVE, _MOVE_END_IDS, data=payload)
 
     async def move_absolute_memory(self):
         """Start an absolute move of distance in the controller's memory.
@@ -942,9 +960,7 @@ class Tdc(_Tcube):
         <Tdc.set_move_absolute_parameters>`
         command.
         """
-        await self.send_request(MGMSG.MOT_MOVE_ABSOLUTE,
-                                [MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED],
-                                param1=1)
+        await self.send_request(MGMSG.MOT_MOVE_ABSOLUTE, _MOVE_END_IDS, param1=1)
 
     async def move_absolute(self, absolute_distance):
         """Start an absolute move.
@@ -952,17 +968,15 @@ class Tdc(_Tcube):
             integer that specifies the absolute distance in position encoder
             counts.
         """
-        payload = st.pack("<Hl", 1, absolute_distance)
-        await self.send_request(MGMSG.MOT_MOVE_ABSOLUTE,
-                                [MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED],
-                                data=payload)
+        payload = _CHAN_I32.pack(1, absolute_distance)
+        await self.send_request(MGMSG.MOT_MOVE_ABSOLUTE, _MOVE_END_IDS, data=payload)
 
     async def move_jog(self, direction):
         """Start a jog move.
         :param direction: The direction to jog. 1 is forward, 2 is backward.
         """
         await self.send_request(MGMSG.MOT_MOVE_JOG,
-                                [MGMSG.MOT_MOVE_COMPLETED, MGMSG.MOT_MOVE_STOPPED],
+                                _MOVE_END_IDS,
                                 param1=1,
                                 param2=direction)
 
@@ -988,9 +1002,7 @@ class Tdc(_Tcube):
             to stop in a controlled (profiled) manner.
         """
         if await self.is_moving():
-            await self.send_request(MGMSG.MOT_MOVE_STOP,
-                                    [MGMSG.MOT_MOVE_STOPPED, MGMSG.MOT_MOVE_COMPLETED],
-                                    1, stop_mode)
+            await self.send_request(MGMSG.MOT_MOVE_STOP, _MOVE_END_IDS, 1, stop_mode)
 
     async def set_dc_pid_parameters(self,
                                     proportional,
@@ -0,0 +1,48 @@
+import threading
+import unittest
+
+from oxart.devices.debounce import DebouncedSave
+
+
+class DebouncedSaveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.saves = 0
+        self.saved = threading.Event()
+
+    def save(self):
+        self.saves += 1
+        self.saved.set()
+
+    def test_request_coalesces(self):
+        saver = DebouncedSave(self.save, delay=0.05)
+        for _ in range(10):
+            saver.request()
+        self.assertTrue(self.saved.wait(5))
+        self.assertEqual(self.saves, 1)
+        # a new save may be requested once the previous one has run
+        self.saved.clear()
+        saver.request()
+        self.assertTrue(self.saved.wait(5))
+        self.assertEqual(self.saves, 2)
+
+    def test_flush(self):
+        saver = DebouncedSave(self.save, delay=60)
+        saver.flush()
+        self.assertEqual(self.saves, 0)
+        saver.request()
+        saver.flush()
+        self.assertEqual(self.saves, 1)
+        # the pending save has been taken over by the flush
+        saver.flush()
+        self.assertEqual(self.saves, 1)
+
+    def test_save_now(self):
+        saver = DebouncedSave(self.save, delay=60)
+        saver.save_now()
+        self.assertEqual(self.saves, 1)
+        saver.request()
+        saver.save_now()
+        self.assertEqual(self.saves, 2)
+        saver.flush()
+        self.assertEqual(self.saves, 2)
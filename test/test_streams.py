@@ -0,0 +1,76 @@
+import unittest
+
+from oxart.devices.streams import ReadBuffer, _COMPACT_SIZE
+
+
+class FakeStream:
+    """Stream handing out the given bytes, at most `chunk` per read"""
+
+    def __init__(self, data=b"", chunk=None):
+        self.buf = bytearray(data)
+        self.chunk = chunk
+        self.reads = 0
+
+    @property
+    def in_waiting(self):
+        return len(self.buf)
+
+    def read(self, n):
+        self.reads += 1
+        if self.chunk is not None:
+            n = min(n, self.chunk)
+        out = bytes(self.buf[:n])
+        del self.buf[:n]
+        return out
+
+
+class ReadBufferTest(unittest.TestCase):
+
+    def test_ensure_reads_everything_waiting(self):
+        stream = FakeStream(b"abcdef")
+        rx = ReadBuffer(stream)
+        rx.ensure(2)
+        self.assertEqual(rx.data, b"abcdef")
+        self.assertEqual(stream.reads, 1)
+        # already buffered, so no further read
+        rx.ensure(6)
+        self.assertEqual(stream.reads, 1)
+
+    def test_ensure_reads_until_enough(self):
+        rx = ReadBuffer(FakeStream(b"abcdef", chunk=2))
+        rx.ensure(5)
+        self.assertGreaterEqual(len(rx.data) - rx.pos, 5)
+        self.assertEqual(bytes(rx.data[:5]), b"abcde")
+
+    def test_ensure_timeout(self):
+        rx = ReadBuffer(FakeStream(b"ab"))
+        with self.assertRaises(TimeoutError):
+            rx.ensure(3)
+
+    def test_consume(self):
+        rx = ReadBuffer(FakeStream(b"abcdef"))
+        rx.ensure(6)
+        rx.consume(2)
+        self.assertEqual(rx.pos, 2)
+        self.assertEqual(bytes(rx.data[rx.pos:]), b"cdef")
+        rx.consume(4)
+        # fully consumed buffers are emptied
+        self.assertEqual((rx.data, rx.pos), (b"", 0))
+
+    def test_consume_compacts(self):
+        size = _COMPACT_SIZE + 10
+        rx = ReadBuffer(FakeStream(bytes(size) + b"xyz"))
+        rx.ensure(size)
+        rx.consume(_COMPACT_SIZE)
+        # not yet worth compacting
+        self.assertEqual(rx.pos, _COMPACT_SIZE)
+        rx.consume(10)
+        self.assertEqual(rx.pos, 0)
+        self.assertEqual(rx.data, b"xyz")
+
+    def test_clear(self):
+        rx = ReadBuffer(FakeStream(b"abc"))
+        rx.ensure(3)
+        rx.consume(1)
+        rx.clear()
+        self.assertEqual((rx.data, rx.pos), (b"", 0))
@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+try:
+    from oxart.devices.surf_solver import mediator
+except ImportError:
+    mediator = None
+
+
+class MockDriver:
+    """Stands in for the SURF driver, recording the arguments of each call"""
+
+    electrodes = ["E1", "E2", "E3"]
+
+    def __init__(self):
+        self.calls = []
+
+    def get_all_electrode_names(self):
+        return list(self.electrodes)
+
+    def static(self, **kwargs):
+        self.calls.append(kwargs)
+        return np.ones((len(kwargs["electrodes"]), 1)), kwargs["electrodes"]
+
+
+class MockDeviceManager:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get(self, name):
+        return self.driver
+
+
+def wells(names, z):
+    cols = [np.arange(len(z), dtype=float) + k for k in range(10)]
+    return mediator.Wells(list(names), np.asarray(z, dtype=float), *cols)
+
+
+@unittest.skipIf(mediator is None, "SURF mediator dependencies not available")
+class WellsTest(unittest.TestCase):
+
+    def test_pop_well(self):
+        w = wells("abc", [1., 2., 3.])
+        target, rest = mediator._pop_well(w, 1)
+        self.assertEqual(target.name, ["b"])
+        self.assertEqual(list(target.z), [2.])
+        self.assertEqual(rest.name, ["a", "c"])
+        self.assertEqual(list(rest.z), [1., 3.])
+        self.assertEqual(list(rest.width), [0., 2.])
+
+    def test_drop_wells(self):
+        rest = mediator._drop_wells(wells("abcd", [1., 2., 3., 4.]), [0, 2])
+        self.assertEqual(rest.name, ["b", "d"])
+        self.assertEqual(list(rest.z), [2., 4.])
+        self.assertEqual(list(rest.width), [1., 3.])
+
+    def test_insert_wells(self):
+        w = wells("ac", [1., 3.])
+        new = wells("b", [2.])
+        joined = mediator._insert_wells(w, 1, new)
+        self.assertEqual(joined.name, ["a", "b", "c"])
+        self.assertEqual(list(joined.z), [1., 2., 3.])
+        self.assertEqual(list(joined.width), [0., 0., 1.])
+
+    def test_split_well(self):
+        halves = mediator._split_well(wells("a", [1.]), ("l", "r"), 0.5)
+        self.assertEqual(halves.name, ["l", "r"])
+        self.assertEqual(list(halves.z), [0.75, 1.25])
+        self.assertEqual(list(halves.width), [0., 0.])
+
+    def test_concat_wells(self):
+        joined = mediator._concat_wells(wells("a", [1.]), wells("bc", [2., 3.]))
+        self.assertEqual(joined.name, ["a", "b", "c"])
+        self.assertEqual(list(joined.z), [1., 2., 3.])
+
+    def test_wells_dict(self):
+        d = mediator._wells_dict(wells("ab", [1., 2.]))
+        self.assertEqual(list(d), list(mediator.Wells._fields))
+        self.assertEqual(d["name"], ["a", "b"])
+        self.assertEqual(d["z"], [1., 2.])
+        for col in d.values():
+            self.assertIs(type(col), list)
+            self.assertTrue(all(type(x) in (str, float) for x in col))
+
+
+@unittest.skipIf(mediator is None, "SURF mediator dependencies not available")
+class MediatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = MockDriver()
+        self.med = mediator.SURFMediator(MockDeviceManager(self.driver), "surf")
+
+    def test_get_new_waveform(self):
+        wave = self.med.get_new_waveform([0., 1e-4], name=["a", None])
+        self.assertEqual(wave.el_vec, tuple(MockDriver.electrodes))
+        self.assertEqual(wave.fixed_wells[0].name, ["a", "1"])
+
+        (call, ) = self.driver.calls
+        self.assertEqual(call["electrodes"], MockDriver.electrodes)
+        sent = call["wells"]
+        # the driver takes plain lists, not arrays
+        for col in sent.values():
+            self.assertIs(type(col), list)
+        self.assertEqual(sent["name"], ["a", "1"])
+        self.assertEqual(sent["z"], [0., 1e-4])
+        self.assertEqual(sent["width"], [5e-6, 5e-6])
+        self.assertAlmostEqual(sent["d2phidaxial2"][0],
+                               float(self.med.f_to_field(self.med.default_f_axial)))
+
+    def test_f_to_field_round_trip(self):
+        f = np.array([1e6, 2e6])
+        np.testing.assert_allclose(self.med.field_to_f(self.med.f_to_field(f)), f)
@@ -0,0 +1,34 @@
+import unittest
+
+from oxart.devices.thorlabs_apt.driver import MGMSG, Message
+
+
+class MessageTest(unittest.TestCase):
+
+    def test_unpack_from_header_only(self):
+        buf = b"\xff" + Message(MGMSG.MOT_MOVE_HOME, param1=1).pack() + b"\x00"
+        msg = Message.unpack_from(buf, 1)
+        self.assertEqual(msg._id, MGMSG.MOT_MOVE_HOME)
+        self.assertEqual((msg.param1, msg.param2), (1, 0))
+        self.assertFalse(msg.has_data)
+        self.assertIsNone(msg.data)
+
+    def test_unpack_from_with_data(self):
+        data = bytes(range(14))
+        packed = Message(MGMSG.MOT_MOVE_COMPLETED, data=data).pack()
+        # further messages may follow in the buffer
+        msg = Message.unpack_from(bytearray(packed * 2), len(packed))
+        self.assertEqual(msg._id, MGMSG.MOT_MOVE_COMPLETED)
+        self.assertTrue(msg.has_data)
+        self.assertEqual(msg.data_size, len(data))
+        self.assertEqual(msg.data, data)
+
+    def test_unpack_from_matches_unpack(self):
+        packed = Message(MGMSG.HW_GET_INFO, data=bytes(84)).pack()
+        a, b = Message.unpack(packed), Message.unpack_from(packed)
+        for attr in Message.__slots__:
+            self.assertEqual(getattr(a, attr), getattr(b, attr))
+
+    def test_unpack_from_unknown_id(self):
+        msg = Message.unpack_from(b"\x34\x12\x00\x00\x01\x50")
+        self.assertEqual(msg._id, 0x1234)